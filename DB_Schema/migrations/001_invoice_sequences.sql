@@ -0,0 +1,25 @@
+-- Per-month invoice number sequences.
+-- Invoice numbers are INV-YYYYMM-NNN; last_value holds the highest NNN
+-- handed out for the month YYYYMM.
+CREATE TABLE IF NOT EXISTS invoice_sequences (
+    period CHAR(6) PRIMARY KEY,
+    last_value INT UNSIGNED NOT NULL
+);
+
+-- Continue each existing month after the numbers already issued. Safe to
+-- re-run: a month that already has a sequence keeps the higher value.
+INSERT INTO invoice_sequences (period, last_value)
+SELECT period, GREATEST(issued, highest)
+FROM (
+    SELECT DATE_FORMAT(issue_date, '%Y%m') AS period,
+           COUNT(*) AS issued,
+           MAX(CASE
+                   WHEN invoice_number LIKE CONCAT('INV-', DATE_FORMAT(issue_date, '%Y%m'), '-%')
+                   THEN CAST(SUBSTRING_INDEX(invoice_number, '-', -1) AS UNSIGNED)
+                   ELSE 0
+               END) AS highest
+    FROM invoices
+    GROUP BY DATE_FORMAT(issue_date, '%Y%m')
+) existing
+ON DUPLICATE KEY UPDATE
+    last_value = GREATEST(invoice_sequences.last_value, existing.issued, existing.highest);
@@ -0,0 +1,23 @@
+-- Indexes for the hot read paths. Built online: ALGORITHM=INPLACE, LOCK=NONE
+-- keeps the tables readable and writable while InnoDB builds each index.
+
+-- Latest salary per employee (get_employee_salary, month-end invoice run)
+-- and the invoice -> salary join on employee and payment month.
+-- Replaces the implicit foreign key index on salaries.employee_id.
+ALTER TABLE salaries
+    ADD INDEX idx_salaries_employee_payment_date (employee_id, payment_date),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Keyset paging over (issue_date, invoice_id) - InnoDB appends the primary
+-- key to every secondary index - plus the per-employee monthly lookup and
+-- the dashboard's GROUP BY status.
+ALTER TABLE invoices
+    ADD INDEX idx_invoices_issue_date (issue_date),
+    ADD INDEX idx_invoices_employee_issue_date (employee_id, issue_date),
+    ADD INDEX idx_invoices_status (status),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Active employee counts and the name-ordered employee picker
+ALTER TABLE employees
+    ADD INDEX idx_employees_status_name (status, first_name, last_name),
+    ALGORITHM=INPLACE, LOCK=NONE;
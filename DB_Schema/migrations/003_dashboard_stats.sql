@@ -0,0 +1,49 @@
+-- Pre-aggregated dashboard numbers, kept current by the application's write
+-- paths (see the *_stat_deltas helpers in db.py). period is 'YYYYMM' for
+-- per-month figures or 'all' for overall totals.
+--
+-- Metrics:
+--   all:     active_employees, active_salary_count, active_salary_total,
+--            invoices_<status>
+--   YYYYMM:  salary_count, salary_total (by payment month),
+--            invoices_<status>, invoice_amount (by issue month)
+--
+-- `python migrate.py rebuild-stats` recomputes the table from scratch.
+CREATE TABLE IF NOT EXISTS dashboard_stats (
+    period VARCHAR(6) NOT NULL,
+    metric VARCHAR(40) NOT NULL,
+    value DECIMAL(18, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, metric)
+);
+
+-- Seed the table. Safe to re-run: existing rows are overwritten with the
+-- recomputed values.
+INSERT INTO dashboard_stats (period, metric, value)
+SELECT period, metric, value FROM (
+    SELECT 'all' AS period, 'active_employees' AS metric, COUNT(*) AS value
+    FROM employees WHERE status = 'active'
+    UNION ALL
+    SELECT 'all', 'active_salary_count', COUNT(*)
+    FROM salaries s JOIN employees e ON s.employee_id = e.employee_id
+    WHERE e.status = 'active'
+    UNION ALL
+    SELECT 'all', 'active_salary_total', COALESCE(SUM(s.base_salary + COALESCE(s.bonus, 0)), 0)
+    FROM salaries s JOIN employees e ON s.employee_id = e.employee_id
+    WHERE e.status = 'active'
+    UNION ALL
+    SELECT DATE_FORMAT(payment_date, '%Y%m'), 'salary_count', COUNT(*)
+    FROM salaries GROUP BY DATE_FORMAT(payment_date, '%Y%m')
+    UNION ALL
+    SELECT DATE_FORMAT(payment_date, '%Y%m'), 'salary_total', SUM(base_salary + COALESCE(bonus, 0))
+    FROM salaries GROUP BY DATE_FORMAT(payment_date, '%Y%m')
+    UNION ALL
+    SELECT 'all', CONCAT('invoices_', status), COUNT(*)
+    FROM invoices WHERE status IS NOT NULL GROUP BY status
+    UNION ALL
+    SELECT DATE_FORMAT(issue_date, '%Y%m'), CONCAT('invoices_', status), COUNT(*)
+    FROM invoices WHERE status IS NOT NULL GROUP BY DATE_FORMAT(issue_date, '%Y%m'), status
+    UNION ALL
+    SELECT DATE_FORMAT(issue_date, '%Y%m'), 'invoice_amount', SUM(amount)
+    FROM invoices GROUP BY DATE_FORMAT(issue_date, '%Y%m')
+) seed
+ON DUPLICATE KEY UPDATE value = seed.value;
@@ -0,0 +1,27 @@
+-- Persistent queue of invoice emails, drained by the outbox workers
+-- (outbox.py). Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+-- any number of workers or application instances can drain it at once.
+--
+-- status: pending -> sending -> sent, or back to pending with a later
+-- next_attempt_at after a failed attempt, or failed once attempts run out.
+-- While 'sending', next_attempt_at is the end of the worker's lease; a row
+-- whose lease expires (worker crashed) is picked up again.
+--
+-- The indexes are part of the CREATE TABLE, so re-running this migration
+-- after a partial failure is a no-op.
+CREATE TABLE IF NOT EXISTS email_outbox (
+    outbox_id INT PRIMARY KEY AUTO_INCREMENT,
+    invoice_id INT,
+    recipient_email VARCHAR(100) NOT NULL,
+    invoice_number VARCHAR(20) NOT NULL,
+    pdf LONGBLOB NOT NULL,
+    status ENUM('pending', 'sending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error TEXT,
+    sent_at DATETIME NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (invoice_id) REFERENCES invoices(invoice_id),
+    INDEX idx_email_outbox_due (status, next_attempt_at),
+    INDEX idx_email_outbox_invoice (invoice_id)
+);
@@ -0,0 +1,9 @@
+-- Indexes for the salary sheet's filters and sort orders. Every sort is
+-- keyset-paged on (column, salary_id); InnoDB appends the primary key to each
+-- secondary index, so these serve both the ORDER BY and the page seek.
+-- Filtering by employee uses idx_salaries_employee_payment_date (002).
+ALTER TABLE salaries
+    ADD INDEX idx_salaries_payment_date (payment_date),
+    ADD INDEX idx_salaries_status_payment_date (payment_status, payment_date),
+    ADD INDEX idx_salaries_base_salary (base_salary),
+    ALGORITHM=INPLACE, LOCK=NONE;
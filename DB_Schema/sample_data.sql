@@ -3,10 +3,10 @@ INSERT INTO users (email, password) VALUES
 ('admin@company.com', 'admin123');
 
 -- Insert sample employees
-INSERT INTO employees (first_name, last_name, email, phone, department, position, hire_date) VALUES
-('John', 'Doe', 'john.doe@company.com', '1234567890', 'IT', 'Senior Developer', '2022-01-01'),
-('Jane', 'Smith', 'jane.smith@company.com', '0987654321', 'HR', 'HR Manager', '2022-02-15'),
-('Mike', 'Johnson', 'mike.johnson@company.com', '5555555555', 'Finance', 'Accountant', '2022-03-01');
+INSERT INTO employees (first_name, last_name, email, phone, position, hire_date) VALUES
+('John', 'Doe', 'john.doe@company.com', '1234567890', 'Senior Developer', '2022-01-01'),
+('Jane', 'Smith', 'jane.smith@company.com', '0987654321', 'HR Manager', '2022-02-15'),
+('Mike', 'Johnson', 'mike.johnson@company.com', '5555555555', 'Accountant', '2022-03-01');
 
 -- Insert sample salaries
 INSERT INTO salaries (employee_id, base_salary, bonus, payment_date, payment_status) VALUES
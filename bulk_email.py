@@ -0,0 +1,73 @@
+"""Month-end bulk invoice emailing.
+
+queue_invoice_emails() renders invoice PDFs across a pool of worker
+processes and queues each one in the email outbox as soon as it is
+rendered; the outbox workers (outbox.py) do the sending. Small batches are
+rendered in this process, where they finish before a pool could start.
+
+Measured locally (reportlab 4.3, Python 3.11): an invoice renders in about
+1 ms in process and 1.2 ms in a worker. Starting a spawned worker and
+getting its first PDF back takes about 105 ms (160 ms when workers also
+imported the GUI, outbox and database modules). With 4 processes the pool
+starts paying off at around 150 invoices.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from outbox import enqueue_invoice_email
+from pdf_render_worker import render_invoice
+
+# Worker processes used to render PDFs (default: one per CPU)
+RENDER_PROCESSES = int(os.getenv('PDF_RENDER_PROCESSES', 0)) or None
+# Smaller batches are rendered without starting the worker processes
+POOL_MIN_INVOICES = int(os.getenv('PDF_RENDER_POOL_MIN', 150))
+
+def queue_invoice_emails(invoices, progress=None, processes=None):
+    """Render and queue one email per invoice.
+
+    invoices are rows as returned by get_month_invoices.
+    progress(done, total) is called as each invoice is queued; returning
+    False cancels the invoices not yet rendered.
+
+    Returns [(record, error or None)] for the invoices handled.
+    """
+    results = []
+    if not invoices:
+        return results
+
+    processes = processes or RENDER_PROCESSES or os.cpu_count() or 1
+    if processes == 1 or len(invoices) < POOL_MIN_INVOICES:
+        queue_rendered(invoices, map(render_invoice, invoices), results, progress)
+        return results
+
+    # Spawn rather than fork: forking the multithreaded GUI process can
+    # leave a child holding a lock another thread had taken
+    with ProcessPoolExecutor(max_workers=processes,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Results come back in order as they are rendered, so emails start
+        # queueing while later PDFs are still being drawn
+        rendered = pool.map(render_invoice, invoices,
+                            chunksize=max(1, min(16, len(invoices) // 64)))
+        try:
+            if not queue_rendered(invoices, rendered, results, progress):
+                pool.shutdown(wait=False, cancel_futures=True)
+        except BrokenProcessPool as e:
+            # A render process died; report the rest as not sent
+            print(f"PDF render pool failed: {e}")
+            results += [(record, "PDF rendering stopped") for record in invoices[len(results):]]
+    return results
+
+def queue_rendered(invoices, rendered, results, progress=None):
+    # Queue each (pdf_bytes, error) in rendered as it arrives, appending to
+    # results; returns False if progress() cancelled the run
+    total = len(invoices)
+    for done, (record, (pdf_bytes, error)) in enumerate(zip(invoices, rendered), 1):
+        if error is None and enqueue_invoice_email(
+                record['invoice_id'], record['employee_email'],
+                record['invoice_number'], pdf_bytes) is None:
+            error = "Could not queue email"
+        results.append((record, error))
+        if progress and progress(done, total) is False:
+            return False
+    return True
@@ -0,0 +1,125 @@
+from PyQt6.QtCharts import (QChart, QChartView, QBarSeries, QBarSet,
+                            QBarCategoryAxis, QValueAxis, QPieSeries)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor, QPainter
+
+class _ChartView(QChartView):
+    """QChartView with the dashboard's look and an empty/error message state.
+
+    Subclasses build their series once; set_data() then updates them in
+    place, so a refresh never creates a new chart.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.chart = QChart()
+        self.chart.setBackgroundVisible(False)
+        self.chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
+        self.chart.legend().setVisible(False)
+        self.setChart(self.chart)
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setMinimumHeight(300)
+
+    def show_message(self, text, color="#718096"):
+        # Shown over an empty chart, e.g. "No data" or a load error
+        self.chart.setTitle(text)
+        self.chart.setTitleBrush(QColor(color))
+
+    def clear_message(self):
+        self.chart.setTitle("")
+
+
+class HistogramChart(_ChartView):
+    """Bar chart of pre-binned counts over equal-width buckets."""
+
+    def __init__(self, color, x_title="", y_title="", empty_text="No data available", parent=None):
+        super().__init__(parent)
+        self.empty_text = empty_text
+        self.bars = QBarSet("")
+        self.bars.setColor(QColor(color))
+        self.series = QBarSeries()
+        self.series.setBarWidth(1.0)
+        self.series.append(self.bars)
+        self.chart.addSeries(self.series)
+
+        self.x_axis = QBarCategoryAxis()
+        self.x_axis.setTitleText(x_title)
+        self.x_axis.setLabelsAngle(-90)
+        self.y_axis = QValueAxis()
+        self.y_axis.setTitleText(y_title)
+        self.y_axis.setLabelFormat("%d")
+        self.chart.addAxis(self.x_axis, Qt.AlignmentFlag.AlignBottom)
+        self.chart.addAxis(self.y_axis, Qt.AlignmentFlag.AlignLeft)
+        self.series.attachAxis(self.x_axis)
+        self.series.attachAxis(self.y_axis)
+
+    def set_data(self, low, high, counts):
+        """Show counts[i] for the i-th of len(counts) buckets between low and high"""
+        if self.bars.count():
+            self.bars.remove(0, self.bars.count())
+        if not counts:
+            self.x_axis.clear()
+            self.y_axis.setRange(0, 1)
+            self.show_message(self.empty_text)
+            return
+
+        low, high = float(low), float(high)
+        if high == low:
+            # Every value is the same: one bar, whatever the bucket count
+            counts = [sum(counts)]
+        self.bars.append([float(count) for count in counts])
+        self.x_axis.setCategories(self._labels(low, high, len(counts)))
+        self.y_axis.setRange(0, max(counts))
+        self.y_axis.applyNiceNumbers()
+        self.clear_message()
+
+    @staticmethod
+    def _labels(low, high, buckets):
+        # One "start–end" label per bucket. QBarCategoryAxis drops duplicate
+        # categories, so edges get the fewest decimals that keep them distinct.
+        width = (high - low) / buckets
+        if width == 0:
+            return [HistogramChart._format(low)]
+        scale, suffix = (1000, "k") if max(abs(low), abs(high)) >= 1000 and width >= 10 else (1, "")
+        values = [(low + i * width) / scale for i in range(buckets + 1)]
+        for decimals in range(7):
+            edges = [f"{value:,.{decimals}f}{suffix}" for value in values]
+            if len(set(edges)) == len(edges):
+                break
+        return [f"{start}–{end}" for start, end in zip(edges, edges[1:])]
+
+    @staticmethod
+    def _format(value):
+        return f"{value / 1000:,.0f}k" if abs(value) >= 1000 else f"{value:,.0f}"
+
+
+class PieChart(_ChartView):
+    """Pie chart of (label, value) pairs, labelled with their percentage."""
+
+    def __init__(self, colors, empty_text="No data available", parent=None):
+        super().__init__(parent)
+        self.colors = [QColor(color) for color in colors]
+        self.empty_text = empty_text
+        self.series = QPieSeries()
+        self.chart.addSeries(self.series)
+        self.slices = {}
+
+    def set_data(self, items):
+        items = [(label, float(value)) for label, value in items if value]
+        for label in set(self.slices) - {label for label, _ in items}:
+            self.series.remove(self.slices.pop(label))
+        if not items:
+            self.show_message(self.empty_text)
+            return
+
+        total = sum(value for _, value in items)
+        for i, (label, value) in enumerate(items):
+            pie_slice = self.slices.get(label)
+            if pie_slice is None:
+                pie_slice = self.series.append(label, value)
+                pie_slice.setLabelVisible(True)
+                self.slices[label] = pie_slice
+            pie_slice.setValue(value)
+            pie_slice.setLabel(f"{label} {value / total:.1%}")
+            pie_slice.setColor(self.colors[i % len(self.colors)])
+        self.clear_message()
@@ -5,11 +5,8 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                            QDateEdit, QSpinBox, QFileDialog, QMessageBox)
 from PyQt6.QtCore import Qt, QDate
 from PyQt6.QtGui import QFont, QColor
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import numpy as np
 from datetime import datetime
+from charts import HistogramChart, PieChart
 
 class DashboardWindow(QMainWindow):
     def __init__(self, user_data):
@@ -321,18 +318,21 @@ class DashboardWindow(QMainWindow):
             }
         """)
         layout = QVBoxLayout(frame)
+        layout.addWidget(self.create_chart_title('Salary Distribution'))
         
-        figure = Figure(figsize=(6, 4))
-        canvas = FigureCanvas(figure)
-        ax = figure.add_subplot(111)
+        chart = HistogramChart('#1a237e', 'Salary Range', 'Number of Employees')
         
+        # Bucket into 10 equal-width bins
         salaries = [emp['salary'] for emp in self.employees]
-        ax.hist(salaries, bins=10, color='#1a237e', alpha=0.7)
-        ax.set_title('Salary Distribution')
-        ax.set_xlabel('Salary Range')
-        ax.set_ylabel('Number of Employees')
+        bins = 10
+        low, high = min(salaries), max(salaries)
+        width = (high - low) / bins or 1
+        counts = [0] * bins
+        for salary in salaries:
+            counts[min(int((salary - low) / width), bins - 1)] += 1
+        chart.set_data(low, high, counts)
         
-        layout.addWidget(canvas)
+        layout.addWidget(chart)
         return frame
 
     def create_department_distribution_chart(self):
@@ -345,22 +345,24 @@ class DashboardWindow(QMainWindow):
             }
         """)
         layout = QVBoxLayout(frame)
+        layout.addWidget(self.create_chart_title('Department Distribution'))
         
-        figure = Figure(figsize=(6, 4))
-        canvas = FigureCanvas(figure)
-        ax = figure.add_subplot(111)
+        chart = PieChart(['#1a237e', '#2196F3', '#4CAF50', '#FF9800'])
         
         dept_count = {}
         for emp in self.employees:
             dept_count[emp['department']] = dept_count.get(emp['department'], 0) + 1
+        chart.set_data(dept_count.items())
         
-        ax.pie(dept_count.values(), labels=dept_count.keys(), autopct='%1.1f%%',
-               colors=['#1a237e', '#2196F3', '#4CAF50', '#FF9800'])
-        ax.set_title('Department Distribution')
-        
-        layout.addWidget(canvas)
+        layout.addWidget(chart)
         return frame
 
+    def create_chart_title(self, text):
+        title = QLabel(text)
+        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        title.setStyleSheet("color: #333;")
+        return title
+
     def calculate_average_salary(self):
         if not self.employees:
             return 0
@@ -1,47 +1,51 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                                QLabel, QFrame, QGridLayout)
-from PyQt6.QtCore import Qt
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import numpy as np
-from db import get_db_connection
+from PyQt6.QtCore import Qt, QTimer
+import os
+from db import get_dashboard_stats, get_salary_histogram, get_dashboard_version
+from data_loader import DataLoader
+from charts import HistogramChart, PieChart
+
+# How often the dashboard checks for changes while it is visible; 0 disables
+REFRESH_SECONDS = int(os.getenv('DASHBOARD_REFRESH_SECONDS', 30))
+
+def fetch_dashboard_data():
+    """Run every dashboard query; called on a DataLoader worker thread"""
+    # Counts, averages and invoice statuses come pre-aggregated from dashboard_stats
+    stats = get_dashboard_stats()
+    total_employees = int(stats.get('active_employees', 0))
+    salary_count = stats.get('active_salary_count', 0)
+    avg_salary = stats.get('active_salary_total', 0) / salary_count if salary_count else 0
+    invoice_data = [
+        (metric[len('invoices_'):], int(value))
+        for metric, value in sorted(stats.items())
+        if metric.startswith('invoices_') and value
+    ]
+
+    # Salary distribution, already bucketed by the server
+    histogram = get_salary_histogram()
+    if histogram is None:
+        raise RuntimeError("Failed to load salary distribution")
+
+    return {
+        # Change marker read in the same query as the numbers it describes
+        'version': stats.get('changes', 0),
+        'total_employees': total_employees,
+        'avg_salary': avg_salary,
+        'salary_histogram': histogram,
+        'invoice_data': invoice_data
+    }
 
 class DashboardView(QWidget):
     def __init__(self, user_data):
         super().__init__()
         self.user_data = user_data
-        self.conn = get_db_connection()
+        self.loader = DataLoader(self)
+        self.version = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.check_for_changes)
         self.init_ui()
 
-    def get_dashboard_data(self):
-        try:
-            cursor = self.conn.cursor()
-            
-            # Get total employees
-            cursor.execute("SELECT COUNT(*) as count FROM employees WHERE status = 'active'")
-            total_employees = cursor.fetchone()[0]
-            
-            # Get average salary
-            cursor.execute("""
-                SELECT COALESCE(AVG(base_salary + COALESCE(bonus, 0)), 0) as avg_salary 
-                FROM salaries s 
-                JOIN employees e ON s.employee_id = e.employee_id 
-                WHERE e.status = 'active'
-            """)
-            avg_salary = cursor.fetchone()[0]
-            
-            cursor.close()
-            return {
-                'total_employees': total_employees,
-                'avg_salary': avg_salary
-            }
-        except Exception as e:
-            print(f"Error fetching dashboard data: {e}")
-            return {
-                'total_employees': 0,
-                'avg_salary': 0
-            }
-
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -55,22 +59,31 @@ class DashboardView(QWidget):
             font-weight: bold;
             margin-bottom: 20px;
         """)
-        layout.addWidget(header)
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(header)
+        header_layout.addStretch()
 
-        # Get real data from database
-        dashboard_data = self.get_dashboard_data()
+        # Shown while the dashboard queries run in the background
+        self.loading_label = QLabel("Loading...")
+        self.loading_label.setStyleSheet("color: #718096; font-size: 14px;")
+        self.loading_label.hide()
+        self.loader.busy_changed.connect(self.loading_label.setVisible)
+        header_layout.addWidget(self.loading_label)
+        layout.addLayout(header_layout)
 
-        # Stats cards
+        # Stats cards; values are filled in when the data arrives
         stats_layout = QGridLayout()
         stats_layout.setSpacing(20)
 
         stats_data = [
-            ("Total Employees", str(dashboard_data['total_employees']), "👥"),
-            ("Average Salary", f"${dashboard_data['avg_salary']:,.2f}", "💰"),
+            ("total_employees", "Total Employees", "👥"),
+            ("avg_salary", "Average Salary", "💰"),
         ]
 
-        for i, (title, value, icon) in enumerate(stats_data):
-            card = self.create_stat_card(title, value, icon)
+        self.stat_labels = {}
+        for i, (key, title, icon) in enumerate(stats_data):
+            card, value_label = self.create_stat_card(title, "—", icon)
+            self.stat_labels[key] = value_label
             stats_layout.addWidget(card, 0, i)
 
         layout.addLayout(stats_layout)
@@ -78,17 +91,65 @@ class DashboardView(QWidget):
         # Charts
         charts_layout = QHBoxLayout()
         
-        # Salary Distribution Chart
-        salary_chart = self.create_salary_chart()
-        charts_layout.addWidget(salary_chart)
+        # Charts are built once and updated in place on every refresh
+        self.salary_chart = HistogramChart(
+            '#4299e1', 'Salary Range ($)', 'Number of Employees',
+            empty_text='No salary data available')
+        charts_layout.addWidget(self.create_chart_frame("Salary Distribution", self.salary_chart))
 
-        # Invoice Status Chart
-        invoice_chart = self.create_invoice_chart()
-        charts_layout.addWidget(invoice_chart)
+        colors = ['#4299e1', '#48bb78', '#ecc94b', '#f56565']  # blue, green, yellow, red
+        self.invoice_chart = PieChart(colors, empty_text='No invoice data available')
+        charts_layout.addWidget(self.create_chart_frame("Invoice Status Distribution", self.invoice_chart))
 
         layout.addLayout(charts_layout)
         layout.addStretch()
 
+    def load_data(self):
+        self.loader.submit(fetch_dashboard_data, on_result=self.show_data,
+                           on_error=self.show_error, channel="dashboard")
+
+    def check_for_changes(self):
+        # One primary-key read; the full queries only run if something changed
+        self.loader.submit(get_dashboard_version, on_result=self.version_checked,
+                           channel="version")
+
+    def version_checked(self, version):
+        if version is not None and version != self.version:
+            self.load_data()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Other pages change the numbers, so check whenever the dashboard is shown
+        if self.version is None:
+            self.load_data()
+        else:
+            self.check_for_changes()
+        if REFRESH_SECONDS > 0:
+            self.refresh_timer.start(REFRESH_SECONDS * 1000)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if not event.spontaneous():
+            self.refresh_timer.stop()
+            self.loader.cancel()
+
+    def show_data(self, dashboard_data):
+        self.version = dashboard_data['version']
+        self.stat_labels['total_employees'].setText(str(dashboard_data['total_employees']))
+        self.stat_labels['avg_salary'].setText(f"${dashboard_data['avg_salary']:,.2f}")
+        histogram = dashboard_data['salary_histogram']
+        self.salary_chart.set_data(histogram['low'], histogram['high'], histogram['counts'])
+        self.invoice_chart.set_data(dashboard_data['invoice_data'])
+
+    def show_error(self, error):
+        print(f"Error fetching dashboard data: {error}")
+        self.stat_labels['total_employees'].setText("0")
+        self.stat_labels['avg_salary'].setText("$0.00")
+        self.salary_chart.set_data(0, 0, [])
+        self.salary_chart.show_message("Error loading salary data", "#e53e3e")
+        self.invoice_chart.set_data([])
+        self.invoice_chart.show_message("Error loading invoice data", "#e53e3e")
+
     def create_stat_card(self, title, value, icon):
         card = QFrame()
         card.setStyleSheet("""
@@ -118,9 +179,9 @@ class DashboardView(QWidget):
         value_label.setStyleSheet("font-size: 24px; font-weight: bold; color: #2d3748;")
         card_layout.addWidget(value_label)
 
-        return card
+        return card, value_label
 
-    def create_salary_chart(self):
+    def create_chart_frame(self, title_text, chart):
         frame = QFrame()
         frame.setStyleSheet("""
             QFrame {
@@ -131,91 +192,8 @@ class DashboardView(QWidget):
         """)
         layout = QVBoxLayout(frame)
         
-        title = QLabel("Salary Distribution")
+        title = QLabel(title_text)
         title.setStyleSheet("font-size: 18px; font-weight: bold; color: #2d3748;")
         layout.addWidget(title)
-
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT base_salary + COALESCE(bonus, 0) as total_salary 
-                FROM salaries s 
-                JOIN employees e ON s.employee_id = e.employee_id 
-                WHERE e.status = 'active'
-            """)
-            salary_data = cursor.fetchall()
-            cursor.close()
-            
-            salaries = [row[0] for row in salary_data]
-
-            fig, ax = plt.subplots()
-            if salaries:
-                ax.hist(salaries, bins=min(30, len(salaries)), color='#4299e1')
-                ax.set_xlabel('Salary Range ($)')
-                ax.set_ylabel('Number of Employees')
-            else:
-                ax.text(0.5, 0.5, 'No salary data available', 
-                       horizontalalignment='center', verticalalignment='center')
-            
-            canvas = FigureCanvas(fig)
-            layout.addWidget(canvas)
-            
-        except Exception as e:
-            print(f"Error creating salary chart: {e}")
-            error_label = QLabel("Error loading salary data")
-            error_label.setStyleSheet("color: #e53e3e;")
-            layout.addWidget(error_label)
-        
+        layout.addWidget(chart)
         return frame
-
-    def create_invoice_chart(self):
-        frame = QFrame()
-        frame.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
-        layout = QVBoxLayout(frame)
-        
-        title = QLabel("Invoice Status Distribution")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #2d3748;")
-        layout.addWidget(title)
-
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT status, COUNT(*) as count 
-                FROM invoices 
-                GROUP BY status
-            """)
-            invoice_data = cursor.fetchall()
-            cursor.close()
-            
-            statuses = [row[0] for row in invoice_data]
-            counts = [row[1] for row in invoice_data]
-
-            fig, ax = plt.subplots()
-            if invoice_data:
-                colors = ['#4299e1', '#48bb78', '#ecc94b', '#f56565']  # blue, green, yellow, red
-                ax.pie(counts, labels=statuses, autopct='%1.1f%%', colors=colors)
-            else:
-                ax.text(0.5, 0.5, 'No invoice data available', 
-                       horizontalalignment='center', verticalalignment='center')
-            
-            canvas = FigureCanvas(fig)
-            layout.addWidget(canvas)
-            
-        except Exception as e:
-            print(f"Error creating invoice chart: {e}")
-            error_label = QLabel("Error loading invoice data")
-            error_label.setStyleSheet("color: #e53e3e;")
-            layout.addWidget(error_label)
-        
-        return frame
-
-    def closeEvent(self, event):
-        # Clean up matplotlib figures when the widget is closed
-        plt.close('all')
-        event.accept()
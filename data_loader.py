@@ -0,0 +1,106 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class _RequestSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class _Request(QRunnable):
+    def __init__(self, fn, args, on_result, on_error, channel):
+        super().__init__()
+        # The loader keeps a reference until the result is delivered
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.on_result = on_result
+        self.on_error = on_error
+        self.channel = channel
+        self.cancelled = False
+        self.signals = _RequestSignals()
+
+    def run(self):
+        if self.cancelled:
+            self.signals.finished.emit(None)
+            return
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+
+class DataLoader(QObject):
+    """Runs database reads on a QThreadPool and hands results back on the GUI thread.
+
+    submit(fn, *args, on_result=..., on_error=...) calls fn(*args) on a worker
+    thread; on_result(result) or on_error(exception) is then called on the
+    GUI thread. fn must not touch any widgets.
+
+    Submitting with a ``channel`` cancels the previous request on that
+    channel, so a newer load always wins. cancel() drops pending requests:
+    ones still queued never run, and results of ones already running are
+    discarded. busy_changed(bool) fires when the loader starts or stops
+    having live requests, for showing a loading state.
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._requests = []
+
+    @property
+    def busy(self):
+        return any(not request.cancelled for request in self._requests)
+
+    def submit(self, fn, *args, on_result=None, on_error=None, channel=None):
+        was_busy = self.busy
+        if channel is not None:
+            self._cancel(lambda request: request.channel == channel)
+
+        request = _Request(fn, args, on_result, on_error, channel)
+        request.signals.finished.connect(lambda result: self._finished(request, result))
+        request.signals.failed.connect(lambda error: self._failed(request, error))
+        self._requests.append(request)
+        self.pool.start(request)
+
+        if not was_busy:
+            self.busy_changed.emit(True)
+        return request
+
+    def cancel(self, channel=None):
+        was_busy = self.busy
+        self._cancel(lambda request: channel is None or request.channel == channel)
+        if was_busy and not self.busy:
+            self.busy_changed.emit(False)
+
+    def _cancel(self, matches):
+        for request in list(self._requests):
+            if request.cancelled or not matches(request):
+                continue
+            request.cancelled = True
+            if self.pool.tryTake(request):
+                # Never started, so no result will arrive for it
+                self._requests.remove(request)
+
+    def _done(self, request):
+        was_busy = self.busy
+        if request in self._requests:
+            self._requests.remove(request)
+        if was_busy and not self.busy:
+            self.busy_changed.emit(False)
+        return not request.cancelled
+
+    def _finished(self, request, result):
+        if self._done(request) and request.on_result:
+            request.on_result(result)
+
+    def _failed(self, request, error):
+        if not self._done(request):
+            return
+        if request.on_error:
+            request.on_error(error)
+        else:
+            print(f"Error loading data: {error}")
@@ -3,74 +3,305 @@ import os
 import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
+from collections import deque, OrderedDict
+from functools import wraps
+from contextlib import contextmanager
+import threading
+import time
 
 # Load environment variables
 load_dotenv()
 
-class DatabaseConnection:
-    _instance = None
+class PooledConnection:
+    """Connection checked out of a ConnectionPool.
+
+    Behaves like the underlying mysql.connector connection, except that
+    close() hands it back to the pool instead of tearing it down.
+    """
+
     _connection = None
 
-    @classmethod
-    def get_instance(cls):
-        if cls._instance is None:
-            cls._instance = DatabaseConnection()
-        return cls._instance
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise Error("Connection has already been returned to the pool")
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Safety net for callers that forget to close()
+        self.close()
+
+    def close(self):
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool.release(connection)
+
+
+class ConnectionPool:
+    """Fixed-size, thread-safe pool of MySQL connections.
+
+    Connections are created lazily up to ``size``, pinged before being
+    handed out, rolled back when returned and closed by a background
+    reaper once they have been idle for longer than ``idle_timeout``
+    seconds.
+    """
+
+    def __init__(self, size=None, idle_timeout=None, checkout_timeout=None):
+        self.size = size or int(os.getenv('DB_POOL_SIZE', 5))
+        self.idle_timeout = idle_timeout or float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300))
+        self.checkout_timeout = checkout_timeout or float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', 30))
+        self._idle = deque()  # (connection, returned_at), most recently used on the right
+        self._open = 0
+        self._lock = threading.Condition()
+        self._reaper = None
+        self._stop_reaper = threading.Event()
+        self._closed = False
+        self._announced = False
+
+    def _create_connection(self):
+        connection = mysql.connector.connect(
+            host=os.getenv('DB_HOST'),
+            database=os.getenv('DB_NAME'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('DB_PASSWORD')
+        )
+        if not self._announced:
+            self._announced = True
+            print("Successfully connected to the database!")
+
+            # Get and print database version
+            cursor = connection.cursor()
+            cursor.execute("SELECT VERSION()")
+            db_version = cursor.fetchone()
+            print(f"MySQL database version: {db_version[0]}")
+            cursor.close()
+        return connection
+
+    def _start_reaper(self):
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_loop, name="db-pool-reaper", daemon=True)
+            self._reaper.start()
 
-    def connect(self):
-        if not self._connection or not self._connection.is_connected():
+    def _reap_loop(self):
+        while not self._stop_reaper.wait(self.idle_timeout / 2):
+            self.reap_idle()
+
+    def reap_idle(self):
+        # Close connections that have sat unused for longer than idle_timeout
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._lock:
+            while self._idle and self._idle[0][1] < cutoff:
+                expired.append(self._idle.popleft()[0])
+            if expired:
+                self._open -= len(expired)
+                self._lock.notify_all()
+        for connection in expired:
+            self._discard(connection)
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    def acquire(self, timeout=None):
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise Error("Connection pool is closed")
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Error(f"Timed out waiting for a database connection (pool size {self.size})")
+                    self._lock.wait(remaining)
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                else:
+                    connection = None
+                    self._open += 1
+                self._start_reaper()
+
+            if connection is None:
+                try:
+                    connection = self._create_connection()
+                except Error as e:
+                    print(f"Error connecting to database: {e}")
+                    self._forget()
+                    raise
+                return PooledConnection(self, connection)
+
+            # Health check on borrow: drop connections the server has closed
             try:
-                self._connection = mysql.connector.connect(
-                    host=os.getenv('DB_HOST'),
-                    database=os.getenv('DB_NAME'),
-                    user=os.getenv('DB_USER'),
-                    password=os.getenv('DB_PASSWORD')
-                )
-                if self._connection.is_connected():
-                    print("Successfully connected to the database!")
-                    
-                    # Get and print database version
-                    cursor = self._connection.cursor()
-                    cursor.execute("SELECT VERSION()")
-                    db_version = cursor.fetchone()
-                    print(f"MySQL database version: {db_version[0]}")
-                    
-                    # Get and print list of tables
-                    cursor.execute("SHOW TABLES;")
-                    tables = cursor.fetchall()
-                    
-                    print("\nList of tables in the database:")
-                    print("--------------------------------")
-                    for (table_name,) in tables:
-                        print(f"- {table_name}")
-                    
-                    cursor.close()
-            except Error as e:
-                print(f"Error connecting to database: {e}")
-                raise e
-        return self._connection
-
-    def get_connection(self):
-        return self.connect()
+                if connection.is_connected():
+                    return PooledConnection(self, connection)
+            except Error:
+                pass
+            self._forget()
+            self._discard(connection)
+
+    def release(self, connection):
+        try:
+            # Never leak an open transaction (or a stale snapshot) to the next borrower
+            connection.rollback()
+            healthy = True
+        except Error:
+            healthy = False
+
+        with self._lock:
+            if healthy and not self._closed:
+                self._idle.append((connection, time.monotonic()))
+                self._lock.notify()
+                return
+        self._forget()
+        self._discard(connection)
+
+    def _forget(self):
+        with self._lock:
+            self._open -= 1
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            connection.close()
 
     def close(self):
-        if self._connection and self._connection.is_connected():
-            self._connection.close()
-            print("Database connection closed.")
-            self._connection = None
+        self._stop_reaper.set()
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, deque()
+            self._open -= len(idle)
+            self._lock.notify_all()
+        for connection, _ in idle:
+            self._discard(connection)
+        if idle:
+            print("Database connections closed.")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = ConnectionPool()
+        return _pool
 
-# Global function to get database connection
+# Check a connection out of the shared pool. Calling close() on it returns
+# it to the pool; prefer the db_connection() context manager.
 def get_db_connection():
-    return DatabaseConnection.get_instance().get_connection()
+    return get_pool().acquire()
 
-# Global function to close database connection
+# Context manager that checks a pooled connection out and back in
+def db_connection():
+    return get_pool().connection()
+
+# Close all idle pooled connections (e.g. on application exit)
 def close_db_connection():
-    DatabaseConnection.get_instance().close()
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
 
-# Invoice-related database operations
-def get_employees():
-    try:
-        connection = get_db_connection()
+class QueryCache:
+    """In-process cache for lookup query results, with a TTL and LRU eviction.
+
+    Entries are tagged with the tables they were read from; writes call
+    invalidate(table) after committing so the next lookup goes back to
+    MySQL. Other clients' writes are only picked up once the TTL expires.
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        self.max_entries = max_entries or int(os.getenv('DB_CACHE_SIZE', 256))
+        self.ttl = ttl if ttl is not None else float(os.getenv('DB_CACHE_TTL', 60))
+        self._entries = OrderedDict()  # key -> (expires_at, tables, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Bumped by invalidate(); a result read before an invalidation is
+        # not stored, since it may predate the write
+        self.generation = 0
+
+    def get(self, key):
+        # Returns (True, value) on a hit, (False, None) on a miss
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[2]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value, tables, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, frozenset(tables), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tables):
+        # Drop entries read from any of the given tables (all entries if none given)
+        with self._lock:
+            self.generation += 1
+            for key in [key for key, (_, entry_tables, _) in self._entries.items()
+                        if not tables or entry_tables.intersection(tables)]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'size': len(self._entries)}
+
+query_cache = QueryCache()
+
+def cached(*tables):
+    # Cache a lookup function's result per arguments. Exceptions are not
+    # cached, so the wrapped function should raise rather than return a
+    # fallback value on error.
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args):
+            key = (fn.__name__,) + args
+            found, value = query_cache.get(key)
+            if not found:
+                generation = query_cache.generation
+                value = fn(*args)
+                query_cache.put(key, value, tables, generation)
+            return value
+        return wrapper
+    return decorator
+
+def invalidate_cache(*tables):
+    query_cache.invalidate(*tables)
+
+def cache_stats():
+    return query_cache.stats()
+
+@cached('employees')
+def _active_employees():
+    with db_connection() as connection:
         cursor = connection.cursor(dictionary=True)
         cursor.execute("""
             SELECT employee_id, CONCAT(first_name, ' ', last_name) as full_name 
@@ -81,89 +312,259 @@ def get_employees():
         employees = cursor.fetchall()
         cursor.close()
         return employees
+
+@cached('employees')
+def _all_employees():
+    with db_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT employee_id, CONCAT(first_name, ' ', last_name) as full_name 
+            FROM employees
+        """)
+        employees = cursor.fetchall()
+        cursor.close()
+        return employees
+
+# Invoice-related database operations
+def get_employees():
+    # Active employees, for the invoice employee picker
+    try:
+        return _active_employees()
     except Error as e:
         print(f"Error fetching employees: {e}")
         return []
 
-def get_invoices():
+def get_all_employees():
+    # Every employee, active or not, for the salary dialog
     try:
-        connection = get_db_connection()
+        return _all_employees()
+    except Error as e:
+        print(f"Error fetching employees: {e}")
+        return []
+
+# Invoice rows as shown in the invoice table. The salary join bounds the bare
+# payment_date column by the invoice's month so it can use the
+# (employee_id, payment_date) index instead of MONTH()/YEAR() on every row.
+INVOICE_ROW_QUERY = """
+    SELECT 
+        i.invoice_id,
+        CONCAT(e.first_name, ' ', e.last_name) as employee_name,
+        e.email as employee_email,
+        i.invoice_number,
+        i.amount,
+        s.bonus,
+        i.issue_date,
+        i.status
+    FROM invoices i
+    JOIN employees e ON i.employee_id = e.employee_id
+    LEFT JOIN salaries s ON i.employee_id = s.employee_id 
+        AND s.payment_date >= i.issue_date - INTERVAL (DAYOFMONTH(i.issue_date) - 1) DAY
+        AND s.payment_date < i.issue_date - INTERVAL (DAYOFMONTH(i.issue_date) - 1) DAY + INTERVAL 1 MONTH
+"""
+
+def get_invoice_page(after=None, limit=100):
+    # Keyset pagination over (issue_date, invoice_id), newest first.
+    # `after` is the (issue_date, invoice_id) of the last row already loaded.
+    # Errors are raised so the model does not mistake them for the end of data.
+    with db_connection() as connection:
         cursor = connection.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT 
-                i.invoice_id,
-                CONCAT(e.first_name, ' ', e.last_name) as employee_name,
-                e.email as employee_email,
-                i.invoice_number,
-                i.amount,
-                s.bonus,
-                i.issue_date,
-                i.status
-            FROM invoices i
-            JOIN employees e ON i.employee_id = e.employee_id
-            LEFT JOIN salaries s ON i.employee_id = s.employee_id 
-                AND MONTH(i.issue_date) = MONTH(s.payment_date)
-                AND YEAR(i.issue_date) = YEAR(s.payment_date)
-            ORDER BY i.issue_date DESC
-        """)
+        where = ""
+        params = []
+        if after is not None:
+            # Written as a bounded range on issue_date so the
+            # (issue_date, invoice_id) index can seek straight to the page
+            where = """
+                WHERE i.issue_date <= %s
+                  AND (i.issue_date < %s OR i.invoice_id < %s)
+            """
+            params = [after[0], after[0], after[1]]
+        cursor.execute(INVOICE_ROW_QUERY + where + """
+            ORDER BY i.issue_date DESC, i.invoice_id DESC
+            LIMIT %s
+        """, params + [limit])
         invoices = cursor.fetchall()
         cursor.close()
         return invoices
+
+def get_invoice(invoice_id):
+    # The invoice row, or None if it no longer exists. Database errors are
+    # raised rather than reported as None, which would read as a deletion.
+    with db_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(INVOICE_ROW_QUERY + " WHERE i.invoice_id = %s LIMIT 1", (invoice_id,))
+        invoice = cursor.fetchone()
+        cursor.close()
+        return invoice
+
+def get_month_invoices(issue_date, statuses=None):
+    # Invoices issued in issue_date's month, optionally limited to the given
+    # statuses, in invoice number order
+    month_start = issue_date.replace(day=1)
+    if month_start.month == 12:
+        month_end = month_start.replace(year=month_start.year + 1, month=1)
+    else:
+        month_end = month_start.replace(month=month_start.month + 1)
+
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            where = " WHERE i.issue_date >= %s AND i.issue_date < %s"
+            params = [month_start, month_end]
+            if statuses:
+                where += f" AND i.status IN ({', '.join(['%s'] * len(statuses))})"
+                params += list(statuses)
+            cursor.execute(INVOICE_ROW_QUERY + where + " ORDER BY i.invoice_number", params)
+            invoices = cursor.fetchall()
+            cursor.close()
+            return invoices
     except Error as e:
-        print(f"Error fetching invoices: {e}")
-        return []
+        print(f"Error fetching invoices for {month_start.strftime('%B %Y')}: {e}")
+        return None
+
+def format_invoice_number(issue_date, number):
+    return f"INV-{issue_date.strftime('%Y%m')}-{str(number).zfill(3)}"
+
+def reserve_invoice_numbers(cursor, issue_date, count=1):
+    # Atomically reserve `count` consecutive invoice numbers in issue_date's
+    # month and return the first one. This is a single primary-key upsert on
+    # invoice_sequences; the sequence row stays locked until the caller's
+    # transaction ends, so concurrent writers queue instead of colliding, and
+    # a rollback hands the numbers back.
+    cursor.execute("""
+        INSERT INTO invoice_sequences (period, last_value)
+        VALUES (%s, LAST_INSERT_ID(%s))
+        ON DUPLICATE KEY UPDATE last_value = LAST_INSERT_ID(last_value + %s)
+    """, (issue_date.strftime('%Y%m'), count, count))
+    cursor.execute("SELECT LAST_INSERT_ID()")
+    last_num = cursor.fetchone()[0]
+    return last_num - count + 1
 
 def create_invoice(employee_id, amount, issue_date, due_date):
     try:
-        connection = get_db_connection()
-        cursor = connection.cursor()
+        with db_connection() as connection:
+            cursor = connection.cursor()
         
-        # Generate invoice number (INV-YYYYMM-XXX)
-        cursor.execute("""
-            SELECT COUNT(*) + 1 as next_num 
-            FROM invoices 
-            WHERE YEAR(issue_date) = YEAR(%s) AND MONTH(issue_date) = MONTH(%s)
-        """, (issue_date, issue_date))
-        next_num = cursor.fetchone()[0]
-        invoice_number = f"INV-{issue_date.strftime('%Y%m')}-{str(next_num).zfill(3)}"
+            # Generate invoice number (INV-YYYYMM-XXX)
+            next_num = reserve_invoice_numbers(cursor, issue_date)
+            invoice_number = format_invoice_number(issue_date, next_num)
         
-        print(f"Creating invoice: {invoice_number} for employee {employee_id}")  # Debug print
+            print(f"Creating invoice: {invoice_number} for employee {employee_id}")  # Debug print
         
-        # Insert new invoice
-        cursor.execute("""
-            INSERT INTO invoices 
-            (employee_id, invoice_number, amount, issue_date, due_date, status) 
-            VALUES (%s, %s, %s, %s, %s, 'draft')
-        """, (employee_id, invoice_number, amount, issue_date, due_date))
+            # Insert new invoice
+            cursor.execute("""
+                INSERT INTO invoices 
+                (employee_id, invoice_number, amount, issue_date, due_date, status) 
+                VALUES (%s, %s, %s, %s, %s, 'draft')
+            """, (employee_id, invoice_number, amount, issue_date, due_date))
         
-        invoice_id = cursor.lastrowid
-        connection.commit()
-        cursor.close()
-        print(f"Created invoice with ID: {invoice_id}")  # Debug print
-        return invoice_id
+            invoice_id = cursor.lastrowid
+            apply_stat_deltas(cursor, invoice_stat_deltas(cursor, invoice_id, 1))
+            connection.commit()
+            cursor.close()
+            print(f"Created invoice with ID: {invoice_id}")  # Debug print
+            return invoice_id
     except Error as e:
         print(f"Error creating invoice: {e}")
         return None
 
+def generate_month_invoices(issue_date, due_date, progress=None, chunk_size=500):
+    # Create draft invoices for every active employee who has a salary on
+    # record and no invoice yet for issue_date's month, in one transaction.
+    # progress(done, total) is called after each chunk is inserted.
+    # Returns the number of invoices created, or None on error.
+    month_start = issue_date.replace(day=1)
+    if month_start.month == 12:
+        month_end = month_start.replace(year=month_start.year + 1, month=1)
+    else:
+        month_end = month_start.replace(month=month_start.month + 1)
+
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                # Latest salary for each active employee, in one set-based query
+                cursor.execute("""
+                    SELECT latest.employee_id, latest.base_salary
+                    FROM (
+                        SELECT s.employee_id, s.base_salary,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY s.employee_id
+                                   ORDER BY s.payment_date DESC, s.salary_id DESC
+                               ) AS rn
+                        FROM salaries s
+                        JOIN employees e ON s.employee_id = e.employee_id
+                        WHERE e.status = 'active'
+                    ) latest
+                    WHERE latest.rn = 1
+                      AND NOT EXISTS (
+                          SELECT 1 FROM invoices i
+                          WHERE i.employee_id = latest.employee_id
+                            AND i.issue_date >= %s AND i.issue_date < %s
+                      )
+                    ORDER BY latest.employee_id
+                """, (month_start, month_end))
+                salaries = cursor.fetchall()
+                total = len(salaries)
+                if progress:
+                    progress(0, total)
+                if not salaries:
+                    return 0
+
+                # Reserve all invoice numbers for the run in one step
+                first_num = reserve_invoice_numbers(cursor, month_start, total)
+
+                rows = [
+                    (employee_id, format_invoice_number(month_start, first_num + n), amount, issue_date, due_date)
+                    for n, (employee_id, amount) in enumerate(salaries)
+                ]
+                for start in range(0, total, chunk_size):
+                    cursor.executemany("""
+                        INSERT INTO invoices 
+                        (employee_id, invoice_number, amount, issue_date, due_date, status) 
+                        VALUES (%s, %s, %s, %s, %s, 'draft')
+                    """, rows[start:start + chunk_size])
+                    if progress:
+                        progress(min(start + chunk_size, total), total)
+
+                period = month_start.strftime('%Y%m')
+                apply_stat_deltas(cursor, [
+                    ('all', 'invoices_draft', total),
+                    (period, 'invoices_draft', total),
+                    (period, 'invoice_amount', sum(amount for _, amount in salaries))
+                ])
+                connection.commit()
+                print(f"Created {total} invoices for {month_start.strftime('%B %Y')}")
+                return total
+            except Error:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    except Error as e:
+        print(f"Error generating invoices: {e}")
+        return None
+
 def update_invoice_status(invoice_id, status):
     try:
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("""
-            UPDATE invoices 
-            SET status = %s 
-            WHERE invoice_id = %s
-        """, (status, invoice_id))
-        connection.commit()
-        cursor.close()
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            apply_stat_deltas(cursor, invoice_stat_deltas(cursor, invoice_id, -1))
+            cursor.execute("""
+                UPDATE invoices 
+                SET status = %s 
+                WHERE invoice_id = %s
+            """, (status, invoice_id))
+            apply_stat_deltas(cursor, invoice_stat_deltas(cursor, invoice_id, 1))
+            connection.commit()
+            cursor.close()
         return True
     except Error as e:
         print(f"Error updating invoice status: {e}")
         return False
 
-def get_employee_salary(employee_id):
-    try:
-        connection = get_db_connection()
+@cached('salaries')
+def _latest_salary(employee_id):
+    with db_connection() as connection:
         cursor = connection.cursor(dictionary=True)
         cursor.execute("""
             SELECT base_salary, bonus 
@@ -174,8 +575,225 @@ def get_employee_salary(employee_id):
         """, (employee_id,))
         salary = cursor.fetchone()
         cursor.close()
+        return salary
+
+def get_employee_salary(employee_id):
+    try:
+        salary = _latest_salary(employee_id)
         print(f"Found salary for employee {employee_id}: {salary}")  # Debug print
         return salary
     except Error as e:
         print(f"Error fetching employee salary: {e}")
         return None
+
+# Dashboard statistics. dashboard_stats holds pre-aggregated numbers per
+# month ('YYYYMM') and overall ('all'). Every write that changes what the
+# dashboard shows retracts the affected row's contribution before the write
+# and adds it back afterwards, in the same transaction:
+#
+#     apply_stat_deltas(cursor, salary_stat_deltas(cursor, salary_id, -1))
+#     cursor.execute("UPDATE salaries ...")
+#     apply_stat_deltas(cursor, salary_stat_deltas(cursor, salary_id, 1))
+#
+# ('all', 'changes') is bumped by every such write, so it doubles as a cheap
+# change marker for the dashboard's auto-refresh.
+DASHBOARD_STATS_QUERY = """
+    SELECT 'all', 'active_employees', COUNT(*)
+    FROM employees WHERE status = 'active'
+    UNION ALL
+    SELECT 'all', 'active_salary_count', COUNT(*)
+    FROM salaries s JOIN employees e ON s.employee_id = e.employee_id
+    WHERE e.status = 'active'
+    UNION ALL
+    SELECT 'all', 'active_salary_total', COALESCE(SUM(s.base_salary + COALESCE(s.bonus, 0)), 0)
+    FROM salaries s JOIN employees e ON s.employee_id = e.employee_id
+    WHERE e.status = 'active'
+    UNION ALL
+    SELECT DATE_FORMAT(payment_date, '%Y%m'), 'salary_count', COUNT(*)
+    FROM salaries GROUP BY DATE_FORMAT(payment_date, '%Y%m')
+    UNION ALL
+    SELECT DATE_FORMAT(payment_date, '%Y%m'), 'salary_total', SUM(base_salary + COALESCE(bonus, 0))
+    FROM salaries GROUP BY DATE_FORMAT(payment_date, '%Y%m')
+    UNION ALL
+    SELECT 'all', CONCAT('invoices_', status), COUNT(*)
+    FROM invoices WHERE status IS NOT NULL GROUP BY status
+    UNION ALL
+    SELECT DATE_FORMAT(issue_date, '%Y%m'), CONCAT('invoices_', status), COUNT(*)
+    FROM invoices WHERE status IS NOT NULL GROUP BY DATE_FORMAT(issue_date, '%Y%m'), status
+    UNION ALL
+    SELECT DATE_FORMAT(issue_date, '%Y%m'), 'invoice_amount', SUM(amount)
+    FROM invoices GROUP BY DATE_FORMAT(issue_date, '%Y%m')
+"""
+
+def apply_stat_deltas(cursor, deltas):
+    # deltas is a list of (period, metric, change)
+    rows = [delta for delta in deltas if delta[2]]
+    if rows:
+        rows.append(('all', 'changes', 1))
+        cursor.executemany("""
+            INSERT INTO dashboard_stats (period, metric, value)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE value = value + VALUES(value)
+        """, rows)
+
+def salary_stat_deltas(cursor, salary_id, sign):
+    cursor.execute("""
+        SELECT s.base_salary + COALESCE(s.bonus, 0), s.payment_date, e.status
+        FROM salaries s
+        LEFT JOIN employees e ON s.employee_id = e.employee_id
+        WHERE s.salary_id = %s
+        FOR UPDATE
+    """, (salary_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return []
+    total, payment_date, status = row
+    period = payment_date.strftime('%Y%m')
+    deltas = [(period, 'salary_count', sign), (period, 'salary_total', sign * total)]
+    if status == 'active':
+        deltas += [('all', 'active_salary_count', sign), ('all', 'active_salary_total', sign * total)]
+    return deltas
+
+def invoice_stat_deltas(cursor, invoice_id, sign):
+    cursor.execute("""
+        SELECT status, issue_date, amount
+        FROM invoices
+        WHERE invoice_id = %s
+        FOR UPDATE
+    """, (invoice_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return []
+    status, issue_date, amount = row
+    period = issue_date.strftime('%Y%m')
+    return [
+        ('all', f'invoices_{status}', sign),
+        (period, f'invoices_{status}', sign),
+        (period, 'invoice_amount', sign * amount)
+    ]
+
+def employee_stat_deltas(cursor, employee_id, sign):
+    # An active employee counts once, and so do all of their salaries
+    cursor.execute("""
+        SELECT e.status, COUNT(s.salary_id),
+               COALESCE(SUM(s.base_salary + COALESCE(s.bonus, 0)), 0)
+        FROM employees e
+        LEFT JOIN salaries s ON s.employee_id = e.employee_id
+        WHERE e.employee_id = %s
+        GROUP BY e.employee_id, e.status
+        FOR UPDATE
+    """, (employee_id,))
+    row = cursor.fetchone()
+    if row is None or row[0] != 'active':
+        return []
+    _, salary_count, salary_total = row
+    return [
+        ('all', 'active_employees', sign),
+        ('all', 'active_salary_count', sign * salary_count),
+        ('all', 'active_salary_total', sign * salary_total)
+    ]
+
+def get_dashboard_stats(period='all'):
+    # Returns {metric: value} for one period, or {} on error
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                "SELECT metric, value FROM dashboard_stats WHERE period = %s",
+                (period,)
+            )
+            stats = dict(cursor.fetchall())
+            cursor.close()
+            return stats
+    except Error as e:
+        print(f"Error fetching dashboard stats: {e}")
+        return {}
+
+def get_dashboard_version():
+    # Current value of the change marker (0 before the first write), or None on error
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT value FROM dashboard_stats
+                WHERE period = 'all' AND metric = 'changes'
+            """)
+            row = cursor.fetchone()
+            cursor.close()
+            return row[0] if row else 0
+    except Error as e:
+        print(f"Error fetching dashboard version: {e}")
+        return None
+
+def rebuild_dashboard_stats():
+    # Recompute dashboard_stats from the base tables in one transaction.
+    # Returns the number of stat rows written, or None on error.
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                # Keep the change marker counting up so open dashboards refresh
+                cursor.execute("DELETE FROM dashboard_stats WHERE metric <> 'changes'")
+                cursor.execute(
+                    "INSERT INTO dashboard_stats (period, metric, value)" + DASHBOARD_STATS_QUERY
+                )
+                rows = cursor.rowcount
+                cursor.execute("""
+                    INSERT INTO dashboard_stats (period, metric, value)
+                    VALUES ('all', 'changes', 1)
+                    ON DUPLICATE KEY UPDATE value = value + 1
+                """)
+                connection.commit()
+                return rows
+            except Error:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    except Error as e:
+        print(f"Error rebuilding dashboard stats: {e}")
+        return None
+
+def get_salary_histogram(max_buckets=30):
+    # Fixed-width histogram of salary + bonus over active employees' salaries,
+    # bucketed in SQL so only one row per bucket leaves the server. Uses
+    # min(max_buckets, number of salaries) buckets between the lowest and
+    # highest value. Returns {'low', 'high', 'counts'} (counts has one entry
+    # per bucket), or None on error.
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                WITH totals AS (
+                    SELECT s.base_salary + COALESCE(s.bonus, 0) AS total
+                    FROM salaries s
+                    JOIN employees e ON s.employee_id = e.employee_id
+                    WHERE e.status = 'active'
+                ), bounds AS (
+                    SELECT MIN(total) AS low, MAX(total) AS high,
+                           LEAST(COUNT(*), %s) AS buckets
+                    FROM totals
+                )
+                SELECT CASE WHEN b.high = b.low THEN 0
+                            ELSE LEAST(FLOOR((t.total - b.low) * b.buckets / (b.high - b.low)),
+                                       b.buckets - 1)
+                       END AS bucket,
+                       COUNT(*), b.low, b.high, b.buckets
+                FROM totals t
+                CROSS JOIN bounds b
+                GROUP BY bucket, b.low, b.high, b.buckets
+                ORDER BY bucket
+            """, (max_buckets,))
+            rows = cursor.fetchall()
+            cursor.close()
+    except Error as e:
+        print(f"Error fetching salary histogram: {e}")
+        return None
+
+    if not rows:
+        return {'low': 0, 'high': 0, 'counts': []}
+    _, _, low, high, buckets = rows[0]
+    counts = [0] * int(buckets)
+    for bucket, count, *_ in rows:
+        counts[int(bucket)] = count
+    return {'low': low, 'high': high, 'counts': counts}
@@ -1,20 +1,15 @@
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.application import MIMEApplication
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def send_invoice_email(recipient_email, invoice_number, pdf_path):
-    # Email configuration
-    sender_email = os.getenv('EMAIL_ADDRESS')
-    app_password = os.getenv('EMAIL_APP_PASSWORD')
+# smtplib and email.mime are imported on first use rather than at
+# application startup.
 
-    if not sender_email or not app_password:
-        print("Error: Email credentials not found in .env file")
-        return False
+def build_invoice_message(sender_email, recipient_email, invoice_number, pdf_bytes):
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.application import MIMEApplication
 
     # Create message
     msg = MIMEMultipart()
@@ -34,23 +29,100 @@ def send_invoice_email(recipient_email, invoice_number, pdf_path):
     msg.attach(MIMEText(body, 'plain'))
 
     # Attach PDF
-    with open(pdf_path, 'rb') as f:
-        pdf_attachment = MIMEApplication(f.read(), _subtype='pdf')
-        pdf_attachment.add_header(
-            'Content-Disposition', 
-            'attachment', 
-            filename=f'Invoice_{invoice_number}.pdf'
-        )
-        msg.attach(pdf_attachment)
-
-    # Send email
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, app_password)
-        server.send_message(msg)
-        server.quit()
-        return True
-    except Exception as e:
-        print(f"Error sending email: {e}")
-        return False
+    pdf_attachment = MIMEApplication(pdf_bytes, _subtype='pdf')
+    pdf_attachment.add_header(
+        'Content-Disposition',
+        'attachment',
+        filename=f'Invoice_{invoice_number}.pdf'
+    )
+    msg.attach(pdf_attachment)
+    return msg
+
+
+class Mailer:
+    """One SMTP session reused across many sends.
+
+    Connects (STARTTLS + login) on the first send and keeps the session
+    open until close(). If the server has dropped the connection, the
+    send is retried once on a fresh session. Settings default to the
+    environment: SMTP_HOST, SMTP_PORT, SMTP_STARTTLS, EMAIL_ADDRESS and
+    EMAIL_APP_PASSWORD. With no password the login step is skipped, which
+    is what a local debugging server (e.g. `python -m aiosmtpd -n`) expects.
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, host=None, port=None, sender_email=None, password=None,
+                 starttls=None, timeout=30):
+        self.host = host or os.getenv('SMTP_HOST', 'smtp.gmail.com')
+        self.port = int(port or os.getenv('SMTP_PORT', 587))
+        self.sender_email = sender_email or os.getenv('EMAIL_ADDRESS')
+        self.password = password if password is not None else os.getenv('EMAIL_APP_PASSWORD')
+        if starttls is None:
+            starttls = os.getenv('SMTP_STARTTLS', '1') not in ('0', 'false', 'no')
+        self.starttls = starttls
+        self.timeout = timeout
+        self._server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def connect(self):
+        import smtplib
+        self.close()
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.password:
+                server.login(self.sender_email, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def close(self):
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+
+    def _session_lost(self, error):
+        import smtplib
+        if isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)):
+            return True
+        # 421: service closing the channel, e.g. idle timeout or too many messages
+        return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == 421
+
+    def send(self, msg):
+        """Send one message, reconnecting once if the session was dropped"""
+        if self._server is None:
+            self.connect()
+        try:
+            self._server.send_message(msg)
+        except Exception as e:
+            if not self._session_lost(e):
+                raise
+            self.connect()
+            self._server.send_message(msg)
+
+    def send_many(self, messages):
+        """Send messages over one session; returns [(msg, error or None)]"""
+        results = []
+        for msg in messages:
+            try:
+                self.send(msg)
+                results.append((msg, None))
+            except Exception as e:
+                print(f"Error sending email to {msg['To']}: {e}")
+                results.append((msg, e))
+        return results
+
+    def send_invoice(self, recipient_email, invoice_number, pdf_bytes):
+        self.send(build_invoice_message(self.sender_email, recipient_email,
+                                        invoice_number, pdf_bytes))
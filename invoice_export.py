@@ -0,0 +1,62 @@
+"""Export many invoices to one file.
+
+export_invoices() writes invoices either as pages of a single PDF or as a
+zip of one PDF per invoice, chosen by the output file's extension. The
+file is written under a temporary name and moved into place when
+complete, so a failed or cancelled export never leaves a partial file.
+"""
+import os
+import zipfile
+from invoice_renderer import draw_invoice
+from pdf_cache import cached_invoice_pdf
+
+def export_invoices(invoices, path, progress=None):
+    """Write invoices to path (.pdf or .zip).
+
+    invoices are rows as returned by get_month_invoices. progress(done,
+    total) is called after each invoice; returning False cancels the
+    export. Returns the number of invoices written, or None if cancelled.
+    """
+    export = export_invoices_zip if path.lower().endswith('.zip') else export_invoices_pdf
+    part_path = path + '.part'
+    done = None
+    try:
+        done = export(invoices, part_path, progress)
+        if done is not None:
+            os.replace(part_path, path)
+        return done
+    finally:
+        if done is None and os.path.exists(part_path):
+            os.remove(part_path)
+
+def export_invoices_pdf(invoices, path, progress=None):
+    # One document, one page per invoice. The layout form and fonts are
+    # stored once and shared by every page, so each page only adds its own
+    # fields. reportlab writes the file on save(), so pages are held in
+    # memory until then (a few KB each).
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+
+    total = len(invoices)
+    c = canvas.Canvas(path, pagesize=letter)
+    c.setTitle("Invoices")
+    for done, invoice in enumerate(invoices, 1):
+        draw_invoice(c, invoice, shared_layout=True)
+        c.showPage()
+        if progress and progress(done, total) is False:
+            return None
+    c.save()
+    return total
+
+def export_invoices_zip(invoices, path, progress=None):
+    # One PDF per invoice (from the PDF cache, or rendered), each written to
+    # the archive before the next, so memory use does not grow with the
+    # number of invoices.
+    # PDF streams are already compressed, so entries are stored as-is.
+    total = len(invoices)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as archive:
+        for done, invoice in enumerate(invoices, 1):
+            archive.writestr(f"Invoice_{invoice['invoice_number']}.pdf", cached_invoice_pdf(invoice))
+            if progress and progress(done, total) is False:
+                return None
+    return total
@@ -1,16 +1,15 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-                           QLabel, QFrame, QWidget, QScrollArea, QFileDialog)
+                           QLabel, QFrame, QWidget, QScrollArea, QFileDialog,
+                           QMessageBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-import os
+from pdf_cache import cached_invoice_pdf
+from invoice_renderer import format_money, invoice_total, STATUS_COLORS, DEFAULT_STATUS_COLOR
 
 class InvoiceViewer(QDialog):
-    def __init__(self, invoice_data, parent=None):
+    def __init__(self, invoice, parent=None):
         super().__init__(parent)
-        self.invoice_data = invoice_data
+        self.invoice = invoice
         self.init_ui()
         
     def init_ui(self):
@@ -80,8 +79,8 @@ class InvoiceViewer(QDialog):
             font-weight: bold;
             color: #0ea5e9;
         """)
-        invoice_number = QLabel(f"Invoice #: {self.invoice_data['id']}")
-        invoice_date = QLabel(f"Date: {self.invoice_data['month']} {self.invoice_data['year']}")
+        invoice_number = QLabel(f"Invoice #: {self.invoice['invoice_number']}")
+        invoice_date = QLabel(f"Date: {self.invoice['issue_date'].strftime('%B %Y')}")
         
         for label in [invoice_number, invoice_date]:
             label.setStyleSheet("""
@@ -110,7 +109,7 @@ class InvoiceViewer(QDialog):
             font-weight: bold;
             color: #1e293b;
         """)
-        employee_name = QLabel(self.invoice_data['employee'])
+        employee_name = QLabel(self.invoice['employee_name'])
         employee_name.setStyleSheet("color: #475569;")
         
         bill_to.addWidget(bill_to_label)
@@ -153,8 +152,8 @@ class InvoiceViewer(QDialog):
 
         # Items
         items = [
-            ("Base Salary", self.invoice_data['amount']),
-            ("Bonus", self.invoice_data['bonus'])
+            ("Base Salary", format_money(self.invoice['amount'])),
+            ("Bonus", format_money(self.invoice['bonus']))
         ]
 
         for desc, amount in items:
@@ -177,7 +176,7 @@ class InvoiceViewer(QDialog):
 
         total_layout = QHBoxLayout()
         total_label = QLabel("Total")
-        total_amount = QLabel(f"${float(self.invoice_data['amount'].replace('$','').replace(',','')) + float(self.invoice_data['bonus'].replace('$','').replace(',','')):.2f}")
+        total_amount = QLabel(format_money(invoice_total(self.invoice)))
         
         total_label.setStyleSheet("""
             font-weight: bold;
@@ -200,13 +199,13 @@ class InvoiceViewer(QDialog):
         # Status
         status_layout = QHBoxLayout()
         status_label = QLabel("Status:")
-        status_value = QLabel(self.invoice_data['status'])
+        status_value = QLabel(self.invoice['status'].capitalize())
         status_value.setStyleSheet(f"""
             color: white;
             padding: 6px 12px;
             border-radius: 4px;
             font-weight: 500;
-            background-color: {('#22c55e' if self.invoice_data['status'] == 'Paid' else '#f97316')};
+            background-color: {STATUS_COLORS.get(self.invoice['status'], DEFAULT_STATUS_COLOR)};
         """)
         
         status_layout.addWidget(status_label)
@@ -253,7 +252,7 @@ class InvoiceViewer(QDialog):
             }
         """)
         
-        if self.invoice_data['status'] == 'Pending':
+        if self.invoice['status'] == 'pending':
             mark_paid_btn = QPushButton("Mark as Paid")
             mark_paid_btn.setStyleSheet("""
                 QPushButton {
@@ -276,111 +275,35 @@ class InvoiceViewer(QDialog):
         close_btn.clicked.connect(self.close)
         main_layout.addLayout(button_layout)
 
-    def generate_pdf(self, show_save_dialog=True):
-        # Create a temporary file path for sending emails
-        temp_path = os.path.join(os.path.dirname(__file__), f"temp_Invoice_{self.invoice_data['id']}.pdf")
-        
-        # Create PDF
-        c = canvas.Canvas(temp_path, pagesize=letter)
-        width, height = letter
-
-        # Company Info
-        c.setFont("Helvetica-Bold", 24)
-        c.drawString(50, height - 50, "EMS Company")
-        
-        c.setFont("Helvetica", 12)
-        c.drawString(50, height - 70, "123 Business Street")
-        c.drawString(50, height - 85, "City, State 12345")
-        c.drawString(50, height - 100, "Phone: (555) 123-4567")
+    def generate_pdf(self):
+        return save_invoice_pdf(self, self.invoice)
 
-        # Invoice Title and Details
-        c.setFont("Helvetica-Bold", 32)
-        c.setFillColor(colors.HexColor('#0ea5e9'))
-        c.drawString(400, height - 50, "INVOICE")
-        
-        c.setFillColor(colors.black)
-        c.setFont("Helvetica", 12)
-        c.drawString(400, height - 70, f"Invoice #: {self.invoice_data['id']}")
-        c.drawString(400, height - 85, f"Date: {self.invoice_data['month']} {self.invoice_data['year']}")
-
-        # Separator Line
-        c.line(50, height - 120, width - 50, height - 120)
+def save_invoice_pdf(parent, invoice):
+    """Ask where to save the invoice and write its PDF there.
 
-        # Bill To Section
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(50, height - 150, "Bill To:")
-        c.setFont("Helvetica", 12)
-        c.drawString(50, height - 170, self.invoice_data['employee'])
+    The PDF is rendered in memory and written once, straight to the chosen
+    file. Returns the path, or None if cancelled or on error.
+    """
+    file_path, _ = QFileDialog.getSaveFileName(
+        parent,
+        "Save Invoice",
+        f"Invoice_{invoice['invoice_number']}.pdf",
+        "PDF Files (*.pdf)"
+    )
+    if not file_path:
+        return None
 
-        # Invoice Details
-        y = height - 220
-        
-        # Headers
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(50, y, "Description")
-        c.drawString(450, y, "Amount")
-        
-        # Separator
-        y -= 10
-        c.line(50, y, width - 50, y)
-        
-        # Items
-        y -= 25
-        c.setFont("Helvetica", 12)
-        
-        # Base Salary
-        c.drawString(50, y, "Base Salary")
-        c.drawString(450, y, self.invoice_data['amount'])
-        
-        # Bonus
-        y -= 25
-        c.drawString(50, y, "Bonus")
-        c.drawString(450, y, self.invoice_data['bonus'])
-        
-        # Total Line
-        y -= 20
-        c.line(50, y, width - 50, y)
-        
-        # Total Amount
-        y -= 25
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(50, y, "Total")
-        total = float(self.invoice_data['amount'].replace('$','').replace(',','')) + \
-               float(self.invoice_data['bonus'].replace('$','').replace(',',''))
-        c.drawString(450, y, f"${total:,.2f}")
-
-        # Status
-        y -= 50
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(50, y, "Status:")
-        c.setFont("Helvetica", 12)
-        status_color = '#22c55e' if self.invoice_data['status'] == 'Paid' else '#f97316'
-        c.setFillColor(colors.HexColor(status_color))
-        c.drawString(100, y, self.invoice_data['status'])
-
-        c.save()
-        
-        # If this was called from the UI button and show_save_dialog is True
-        if self.parent() and show_save_dialog:
-            file_name = f"Invoice_{self.invoice_data['id']}.pdf"
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Save Invoice",
-                file_name,
-                "PDF Files (*.pdf)"
-            )
-            
-            if file_path:
-                # Copy the temp file to the selected location
-                import shutil
-                shutil.copy2(temp_path, file_path)
-                
-                # Clean up temp file
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
-                    
-                return file_path
-        
-        return temp_path
\ No newline at end of file
+    try:
+        pdf_bytes = cached_invoice_pdf(invoice)
+        with open(file_path, 'wb') as f:
+            f.write(pdf_bytes)
+    except Exception as e:
+        print(f"Error saving invoice PDF: {e}")
+        QMessageBox.warning(
+            parent,
+            "Error",
+            "Failed to generate PDF. Please try again.",
+            QMessageBox.StandardButton.Ok
+        )
+        return None
+    return file_path
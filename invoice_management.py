@@ -1,15 +1,35 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                           QLabel, QFrame, QTableWidget, QTableWidgetItem,
+                           QLabel, QFrame, QTableView, QAbstractItemView,
                            QComboBox, QCalendarWidget, QMenu, QHeaderView,
-                           QMessageBox)
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QColor
-from invoice_generator import InvoiceViewer
-from db import (get_employees, get_invoices, create_invoice, 
-               update_invoice_status, get_employee_salary)
+                           QMessageBox, QProgressDialog, QApplication,
+                           QInputDialog, QFileDialog)
+from PyQt6.QtCore import Qt, QDate, QObject, pyqtSignal
+from invoice_generator import InvoiceViewer, save_invoice_pdf
+from pdf_cache import cached_invoice_pdf, invalidate_invoice_pdf
+from data_loader import DataLoader
+from table_models import PagedTableModel
+from table_delegates import StatusPillDelegate, ActionButtonDelegate
+from db import (get_employees, get_invoice_page, get_invoice, create_invoice, 
+               update_invoice_status, get_employee_salary, generate_month_invoices,
+               get_month_invoices)
 from datetime import datetime, timedelta
-from email_utils import send_invoice_email
+from collections import Counter
 import os
+from outbox import enqueue_invoice_email, start_worker
+from bulk_email import queue_invoice_emails
+from invoice_export import export_invoices
+
+# Status filters offered by the month-wide actions
+STATUS_CHOICES = {
+    "Draft": ('draft',),
+    "Sent": ('sent',),
+    "Draft and Sent": ('draft', 'sent'),
+    "All except Cancelled": ('draft', 'sent', 'paid')
+}
+
+def can_mark_paid(status):
+    # Draft and emailed ('sent') invoices can both be paid
+    return status != 'paid'
 
 class MonthYearPicker(QFrame):
     def __init__(self, parent=None):
@@ -85,10 +105,52 @@ class MonthYearPicker(QFrame):
         layout.addWidget(self.month_combo)
         layout.addWidget(self.year_combo)
 
+class InvoiceTableModel(PagedTableModel):
+    headers = ["Invoice ID", "Employee", "Email", "Month", "Year", "Amount", "Bonus", "Status", "Actions"]
+
+    def fetch_page(self, after, limit):
+        return get_invoice_page(after, limit)
+
+    def cursor_key(self, record):
+        return (record['issue_date'], record['invoice_id'])
+
+    def record_key(self, record):
+        return record['invoice_id']
+
+    def fetch_record(self, invoice_id):
+        return get_invoice(invoice_id)
+
+    def display(self, record, column):
+        if column == 0:
+            return record['invoice_number']
+        if column == 1:
+            return record['employee_name']
+        if column == 2:
+            return record['employee_email']
+        if column == 3:
+            return record['issue_date'].strftime("%B")
+        if column == 4:
+            return record['issue_date'].strftime("%Y")
+        if column == 5:
+            return f"${record['amount']:,.2f}"
+        if column == 6:
+            return f"${record['bonus']:,.2f}" if record['bonus'] else "$0.00"
+        if column == 7:
+            return record['status'].capitalize()
+        return None
+
+class OutboxEvents(QObject):
+    # Re-emits outbox worker notifications on the GUI thread
+    finished = pyqtSignal(object, str, object)
+
 class InvoiceManagement(QWidget):
     def __init__(self, user_data):
         super().__init__()
         self.user_data = user_data
+        # Outbox messages queued from this page that have not finished yet,
+        # by invoice_id; other messages finishing do not count against it
+        self.emails_queued = Counter()
+        self.emails_failed = 0
         self.init_ui()
 
     def init_ui(self):
@@ -124,8 +186,26 @@ class InvoiceManagement(QWidget):
             color: #1e293b;
         """)
         header_layout.addWidget(title)
+        header_layout.addStretch()
+
+        # Shown while invoices are being fetched in the background
+        self.loading_label = QLabel("Loading...")
+        self.loading_label.setStyleSheet("color: #64748b; font-size: 14px;")
+        self.loading_label.hide()
+        header_layout.addWidget(self.loading_label)
+
+        # Emails queued from this page that have not been sent yet
+        self.email_status_label = QLabel()
+        self.email_status_label.setStyleSheet("color: #64748b; font-size: 14px; margin-left: 15px;")
+        self.email_status_label.hide()
+        header_layout.addWidget(self.email_status_label)
         layout.addWidget(header)
 
+        self.loader = DataLoader(self)
+        self.outbox_events = OutboxEvents(self)
+        self.outbox_events.finished.connect(self.email_finished)
+        start_worker().add_listener(self.outbox_events.finished.emit)
+
         # Controls section
         controls = QFrame()
         controls.setStyleSheet("""
@@ -152,10 +232,9 @@ class InvoiceManagement(QWidget):
         self.employee_combo = QComboBox()
         self.employee_combo.setObjectName("employee_combo")
         
-        # Load employees from database
-        self.employees = get_employees()
-        for employee in self.employees:
-            self.employee_combo.addItem(employee['full_name'], employee['employee_id'])
+        # Employees are loaded in the background when the page is shown
+        self.employees = None
+        self.employee_combo.setEnabled(False)
             
         self.employee_combo.setStyleSheet("""
             QComboBox {
@@ -226,6 +305,75 @@ class InvoiceManagement(QWidget):
         generate_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         generate_btn.clicked.connect(self.generate_new_invoice)
         controls_layout.addWidget(generate_btn)
+
+        # Month-end run for every active employee
+        generate_all_btn = QPushButton("Generate All for Month")
+        generate_all_btn.setObjectName("generateAllBtn")
+        generate_all_btn.setStyleSheet("""
+            QPushButton#generateAllBtn {
+                background-color: white;
+                color: #0ea5e9;
+                border: 1px solid #0ea5e9;
+                padding: 8px 24px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 14px;
+                min-height: 42px;
+                min-width: 160px;
+            }
+            QPushButton#generateAllBtn:hover {
+                background-color: #f0f9ff;
+            }
+        """)
+        generate_all_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        generate_all_btn.clicked.connect(self.generate_all_invoices)
+        controls_layout.addWidget(generate_all_btn)
+
+        # Month-end emailing of every invoice in the period
+        send_all_btn = QPushButton("Send All for Month")
+        send_all_btn.setObjectName("sendAllBtn")
+        send_all_btn.setStyleSheet("""
+            QPushButton#sendAllBtn {
+                background-color: white;
+                color: #0ea5e9;
+                border: 1px solid #0ea5e9;
+                padding: 8px 24px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 14px;
+                min-height: 42px;
+                min-width: 160px;
+            }
+            QPushButton#sendAllBtn:hover {
+                background-color: #f0f9ff;
+            }
+        """)
+        send_all_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        send_all_btn.clicked.connect(self.send_all_invoices)
+        controls_layout.addWidget(send_all_btn)
+
+        # All of the month's invoices as one file for accounting
+        export_btn = QPushButton("Export Month")
+        export_btn.setObjectName("exportBtn")
+        export_btn.setStyleSheet("""
+            QPushButton#exportBtn {
+                background-color: white;
+                color: #0ea5e9;
+                border: 1px solid #0ea5e9;
+                padding: 8px 24px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 14px;
+                min-height: 42px;
+                min-width: 140px;
+            }
+            QPushButton#exportBtn:hover {
+                background-color: #f0f9ff;
+            }
+        """)
+        export_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        export_btn.clicked.connect(self.export_month_invoices)
+        controls_layout.addWidget(export_btn)
         
         controls_layout.addStretch()
         layout.addWidget(controls)
@@ -243,14 +391,14 @@ class InvoiceManagement(QWidget):
         table_layout.setSpacing(0)
 
         # Invoice Table
-        self.table = QTableWidget()
+        self.table = QTableView()
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: none;
                 background-color: white;
                 gridline-color: #e2e8f0;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border-bottom: 1px solid #e2e8f0;
                 font-size: 14px;
@@ -265,154 +413,74 @@ class InvoiceManagement(QWidget):
                 border-bottom: 2px solid #e2e8f0;
                 height: 50px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: transparent;
                 color: #1e293b;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: transparent;
             }
         """)
         
+        self.model = InvoiceTableModel(self)
+        self.model.loader.busy_changed.connect(self.loading_label.setVisible)
+        self.model.load_failed.connect(self.show_load_error)
+        self.table.setModel(self.model)
+
+        # Status pills and action buttons are painted, not per-row widgets
+        self.table.setItemDelegateForColumn(7, StatusPillDelegate(
+            {'Paid': '#22c55e'}, '#f97316', self.table))
+        action_delegate = ActionButtonDelegate(
+            self.table, size=36, font_size=24, color="#1e293b",
+            background="#f1f5f9", hover_background="#e2e8f0")
+        action_delegate.clicked.connect(self.show_action_menu)
+        self.table.setItemDelegateForColumn(8, action_delegate)
+        self.action_menu = None
         self.setup_table()
+        self.model.reload()
         table_layout.addWidget(self.table)
         layout.addWidget(table_frame)
 
+    def load_employees(self):
+        self.loader.submit(get_employees, on_result=self.set_employees, channel="employees")
+
+    def set_employees(self, employees):
+        self.employees = employees
+        self.employee_combo.clear()
+        for employee in employees:
+            self.employee_combo.addItem(employee['full_name'], employee['employee_id'])
+        self.employee_combo.setEnabled(True)
+
+    def show_load_error(self, message):
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to fetch invoices: {message}",
+            QMessageBox.StandardButton.Ok
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.employees is None:
+            self.load_employees()
+        self.model.resume_loading()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Navigating away: drop loads the user is no longer waiting for
+        if not event.spontaneous():
+            self.loader.cancel()
+            self.model.cancel_loading()
+
     def setup_table(self):
-        headers = ["Invoice ID", "Employee", "Email", "Month", "Year", "Amount", "Bonus", "Status", "Actions"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        
         # Set row and header heights
         self.table.verticalHeader().setDefaultSectionSize(60)
         self.table.horizontalHeader().setFixedHeight(50)
         self.table.verticalHeader().setVisible(False)
         
         # Disable selection
-        self.table.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
-        
-        # Get data from database
-        invoices = get_invoices()
-        self.table.setRowCount(len(invoices))
-        
-        for row, invoice in enumerate(invoices):
-            bg_color = "#f8fafc" if row % 2 else "white"
-            
-            # Extract month and year from issue_date
-            issue_date = invoice['issue_date']
-            month = issue_date.strftime("%B")
-            year = issue_date.strftime("%Y")
-            
-            # Format amount and bonus with currency symbol
-            amount = f"${invoice['amount']:,.2f}"
-            bonus = f"${invoice['bonus']:,.2f}" if invoice['bonus'] else "$0.00"
-            
-            # Add data to cells
-            data = [
-                invoice['invoice_number'],
-                invoice['employee_name'],
-                invoice['employee_email'],
-                month,
-                year,
-                amount,
-                bonus
-            ]
-            
-            for col, text in enumerate(data):
-                item = QTableWidgetItem(str(text))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                # Store invoice_id as item data for later use
-                if col == 0:
-                    item.setData(Qt.ItemDataRole.UserRole, invoice['invoice_id'])
-                self.table.setItem(row, col, item)
-                item.setBackground(QColor(bg_color))
-            
-            # Status label
-            status_widget = QWidget()
-            status_layout = QHBoxLayout(status_widget)
-            status_layout.setContentsMargins(8, 0, 8, 0)
-            status_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            status = invoice['status'].capitalize()
-            status_label = QLabel(status)
-            status_color = '#22c55e' if status == 'Paid' else '#f97316'
-            status_label.setStyleSheet(f"""
-                QLabel {{
-                    color: white;
-                    padding: 6px 12px;
-                    border-radius: 4px;
-                    font-weight: 500;
-                    background-color: {status_color};
-                }}
-            """)
-            status_layout.addWidget(status_label)
-            self.table.setCellWidget(row, 7, status_widget)
-            
-            # Actions column
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            actions_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            action_btn = QPushButton("⋮")
-            action_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #f1f5f9;
-                    color: #1e293b;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 0px;
-                    font-size: 24px;
-                    font-weight: bold;
-                    min-width: 36px;
-                    max-width: 36px;
-                    min-height: 36px;
-                    max-height: 36px;
-                    text-align: center;
-                    line-height: 36px;
-                }
-                QPushButton:hover {
-                    background-color: #e2e8f0;
-                }
-            """)
-            action_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            
-            # Create menu for actions
-            menu = QMenu(self)
-            menu.setStyleSheet("""
-                QMenu {
-                    background-color: white;
-                    border: 1px solid #e2e8f0;
-                    border-radius: 8px;
-                    padding: 8px 0px;
-                    min-width: 160px;
-                }
-                QMenu::item {
-                    padding: 12px 24px;
-                    font-size: 14px;
-                }
-                QMenu::item:selected {
-                    background-color: #f1f5f9;
-                    color: #1e293b;
-                }
-            """)
-            
-            view_action = menu.addAction("👁 View")
-            download_action = menu.addAction("⬇ Download")
-            send_action = menu.addAction("📧 Send Email")
-            if status == "Draft":
-                mark_paid_action = menu.addAction("✓ Mark as Paid")
-                mark_paid_action.triggered.connect(lambda checked, r=row: self.mark_as_paid(r))
-            
-            # Connect actions
-            view_action.triggered.connect(lambda checked, r=row: self.show_invoice_viewer(r))
-            download_action.triggered.connect(lambda checked, r=row: self.download_invoice(r))
-            send_action.triggered.connect(lambda checked, r=row: self.send_invoice_email(r))
-            action_btn.clicked.connect(lambda checked, b=action_btn, m=menu: self.show_action_menu(b, m))
-            
-            actions_layout.addWidget(action_btn)
-            self.table.setCellWidget(row, 8, actions_widget)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
 
         # Make columns responsive
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
@@ -446,22 +514,66 @@ class InvoiceManagement(QWidget):
         self.table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
 
     def show_invoice_viewer(self, row):
-        invoice_data = {
-            'id': self.table.item(row, 0).text(),
-            'employee': self.table.item(row, 1).text(),
-            'month': self.table.item(row, 3).text(),
-            'year': self.table.item(row, 4).text(),
-            'amount': self.table.item(row, 5).text(),
-            'bonus': self.table.item(row, 6).text(),
-            'status': self.table.cellWidget(row, 7).findChild(QLabel).text()
-        }
-        viewer = InvoiceViewer(invoice_data, self)
+        viewer = InvoiceViewer(self.model.record(row), self)
         viewer.exec()
 
-    def show_action_menu(self, button, menu):
-        """Show the action menu below the button"""
-        pos = button.mapToGlobal(button.rect().bottomLeft())
-        menu.exec(pos)
+    def show_action_menu(self, row, pos):
+        """Show the action menu for a row below its button"""
+        if self.action_menu is None:
+            # One menu for the whole table, built the first time it is needed
+            self.action_menu = QMenu(self)
+            self.action_menu.setStyleSheet("""
+                QMenu {
+                    background-color: white;
+                    border: 1px solid #e2e8f0;
+                    border-radius: 8px;
+                    padding: 8px 0px;
+                    min-width: 160px;
+                }
+                QMenu::item {
+                    padding: 12px 24px;
+                    font-size: 14px;
+                }
+                QMenu::item:selected {
+                    background-color: #f1f5f9;
+                    color: #1e293b;
+                }
+            """)
+
+        menu = self.action_menu
+        menu.clear()
+        view_action = menu.addAction("👁 View")
+        download_action = menu.addAction("⬇ Download")
+        send_action = menu.addAction("📧 Send Email")
+        mark_paid_action = None
+        if can_mark_paid(self.model.record(row)['status']):
+            mark_paid_action = menu.addAction("✓ Mark as Paid")
+
+        chosen = menu.exec(pos)
+        if chosen is None:
+            return
+        if chosen == view_action:
+            self.show_invoice_viewer(row)
+        elif chosen == download_action:
+            self.download_invoice(row)
+        elif chosen == send_action:
+            self.send_invoice_email(row)
+        elif chosen == mark_paid_action:
+            self.mark_as_paid(row)
+
+    def selected_period(self):
+        """Issue and due date for the month selected in the period picker"""
+        # Get selected month and year
+        month = self.findChild(QFrame, "date_picker").month_combo.currentText()
+        year = int(self.findChild(QFrame, "date_picker").year_combo.currentText())
+        
+        # Convert month name to number (1-12)
+        month_num = datetime.strptime(month, "%B").month
+        
+        # Create issue date and due date
+        issue_date = datetime(year, month_num, 1)  # First day of month
+        due_date = issue_date + timedelta(days=30)  # Due in 30 days
+        return issue_date, due_date
 
     def generate_new_invoice(self):
         # Get selected employee
@@ -475,16 +587,7 @@ class InvoiceManagement(QWidget):
             )
             return
             
-        # Get selected month and year
-        month = self.findChild(QFrame, "date_picker").month_combo.currentText()
-        year = int(self.findChild(QFrame, "date_picker").year_combo.currentText())
-        
-        # Convert month name to number (1-12)
-        month_num = datetime.strptime(month, "%B").month
-        
-        # Create issue date and due date
-        issue_date = datetime(year, month_num, 1)  # First day of month
-        due_date = issue_date + timedelta(days=30)  # Due in 30 days
+        issue_date, due_date = self.selected_period()
         
         # Get employee's salary information
         salary_info = get_employee_salary(employee_id)
@@ -506,8 +609,8 @@ class InvoiceManagement(QWidget):
         )
         
         if invoice_id:
-            # Refresh the table to show new data
-            self.setup_table()
+            # Show just the new invoice
+            self.model.refresh_record(invoice_id)
             QMessageBox.information(
                 self,
                 "Success",
@@ -522,74 +625,253 @@ class InvoiceManagement(QWidget):
                 QMessageBox.StandardButton.Ok
             )
 
+    def generate_all_invoices(self):
+        """Generate invoices for all active employees for the selected month"""
+        issue_date, due_date = self.selected_period()
+        period = issue_date.strftime("%B %Y")
+
+        reply = QMessageBox.question(
+            self,
+            "Generate Invoices",
+            f"Generate invoices for {period} for every active employee who does not have one yet?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        progress_dialog = QProgressDialog(f"Generating invoices for {period}...", None, 0, 0, self)
+        progress_dialog.setWindowTitle("Generating Invoices")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        def report_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+            QApplication.processEvents()
+
+        created = generate_month_invoices(issue_date, due_date, progress=report_progress)
+        progress_dialog.close()
+
+        if created is None:
+            QMessageBox.warning(
+                self,
+                "Error",
+                "Failed to generate invoices. No invoices were created.",
+                QMessageBox.StandardButton.Ok
+            )
+            return
+
+        if created:
+            self.model.reload()
+        QMessageBox.information(
+            self,
+            "Success",
+            f"Generated {created} invoice(s) for {period}.",
+            QMessageBox.StandardButton.Ok
+        )
+
+    def choose_month_invoices(self, title, prompt):
+        """Ask for a status filter and fetch the selected month's invoices"""
+        issue_date, _ = self.selected_period()
+        choice, ok = QInputDialog.getItem(self, title, prompt, list(STATUS_CHOICES), 0, False)
+        if not ok:
+            return None
+
+        records = get_month_invoices(issue_date, STATUS_CHOICES[choice])
+        if records is None:
+            QMessageBox.warning(
+                self,
+                "Error",
+                "Failed to fetch invoices. Please try again.",
+                QMessageBox.StandardButton.Ok
+            )
+            return None
+        if not records:
+            QMessageBox.information(
+                self,
+                title,
+                f"No {choice.lower()} invoices for {issue_date.strftime('%B %Y')}.",
+                QMessageBox.StandardButton.Ok
+            )
+        return records
+
+    def send_all_invoices(self):
+        """Email every invoice of the selected month with the chosen status"""
+        issue_date, _ = self.selected_period()
+        period = issue_date.strftime("%B %Y")
+
+        records = self.choose_month_invoices("Send Invoices", f"Send invoices for {period} with status:")
+        if not records:
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Send Invoices",
+            f"Email {len(records)} invoice(s) for {period}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        progress_dialog = QProgressDialog(f"Preparing invoices for {period}...", "Cancel",
+                                          0, len(records), self)
+        progress_dialog.setWindowTitle("Sending Invoices")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        def report_progress(done, total):
+            progress_dialog.setValue(done)
+            progress_dialog.setLabelText(f"Queued {done} of {total} invoice(s) for {period}...")
+            QApplication.processEvents()
+            return not progress_dialog.wasCanceled()
+
+        results = queue_invoice_emails(records, progress=report_progress)
+        progress_dialog.close()
+
+        queued = sum(1 for _, error in results if error is None)
+        self.emails_queued.update(record['invoice_id'] for record, error in results if error is None)
+        self.update_email_status()
+
+        # Per-invoice report
+        skipped = len(records) - len(results)
+        failed = len(results) - queued
+        lines = [f"{record['invoice_number']}  {record['employee_email']}  "
+                 f"{'queued' if error is None else 'FAILED: ' + error}"
+                 for record, error in results]
+        lines += [f"{record['invoice_number']}  {record['employee_email']}  cancelled"
+                  for record in records[len(results):]]
+        summary = f"Queued {queued} invoice email(s) for {period}."
+        if failed:
+            summary += f" {failed} failed."
+        if skipped:
+            summary += f" {skipped} cancelled."
+        report = QMessageBox(
+            QMessageBox.Icon.Warning if failed else QMessageBox.Icon.Information,
+            "Send Invoices", summary, QMessageBox.StandardButton.Ok, self)
+        report.setDetailedText("\n".join(lines))
+        report.exec()
+
+    def export_month_invoices(self):
+        """Export the selected month's invoices to one PDF or zip file"""
+        issue_date, _ = self.selected_period()
+        period = issue_date.strftime("%B %Y")
+        records = self.choose_month_invoices("Export Invoices", f"Export invoices for {period} with status:")
+        if not records:
+            return
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Invoices",
+            f"Invoices_{issue_date.strftime('%Y%m')}.pdf",
+            "Combined PDF (*.pdf);;ZIP of PDFs (*.zip)"
+        )
+        if not file_path:
+            return
+        extension = '.zip' if selected_filter.startswith("ZIP") else '.pdf'
+        if os.path.splitext(file_path)[1].lower() not in ('.pdf', '.zip'):
+            file_path += extension
+
+        progress_dialog = QProgressDialog(f"Exporting invoices for {period}...", "Cancel",
+                                          0, len(records), self)
+        progress_dialog.setWindowTitle("Exporting Invoices")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        def report_progress(done, total):
+            # Repaint every 50 invoices rather than after each page
+            if done % 50 == 0 or done == total:
+                progress_dialog.setValue(done)
+                QApplication.processEvents()
+            return not progress_dialog.wasCanceled()
+
+        try:
+            exported = export_invoices(records, file_path, progress=report_progress)
+        except Exception as e:
+            print(f"Error exporting invoices: {e}")
+            exported = False
+        progress_dialog.close()
+
+        if exported is False:
+            QMessageBox.warning(
+                self,
+                "Error",
+                "Failed to export invoices. Please try again.",
+                QMessageBox.StandardButton.Ok
+            )
+        elif exported is not None:
+            QMessageBox.information(
+                self,
+                "Success",
+                f"Exported {exported} invoice(s) to {file_path}",
+                QMessageBox.StandardButton.Ok
+            )
+
     def download_invoice(self, row):
-        """Helper method to download invoice directly"""
-        invoice_data = {
-            'id': self.table.item(row, 0).text(),
-            'employee': self.table.item(row, 1).text(),
-            'month': self.table.item(row, 3).text(),
-            'year': self.table.item(row, 4).text(),
-            'amount': self.table.item(row, 5).text(),
-            'bonus': self.table.item(row, 6).text(),
-            'status': self.table.cellWidget(row, 7).findChild(QLabel).text()
-        }
-        
-        # Create temporary viewer to use its PDF generation
-        viewer = InvoiceViewer(invoice_data, self)
-        return viewer.generate_pdf()  # Return the PDF path
+        """Save the invoice PDF to a file chosen by the user"""
+        return save_invoice_pdf(self, self.model.record(row))
 
     def send_invoice_email(self, row):
-        """Send invoice via email"""
-        invoice_number = self.table.item(row, 0).text()
-        recipient_email = self.table.item(row, 2).text()
-        
-        # First generate/download the PDF
-        invoice_data = {
-            'id': invoice_number,
-            'employee': self.table.item(row, 1).text(),
-            'month': self.table.item(row, 3).text(),
-            'year': self.table.item(row, 4).text(),
-            'amount': self.table.item(row, 5).text(),
-            'bonus': self.table.item(row, 6).text(),
-            'status': self.table.cellWidget(row, 7).findChild(QLabel).text()
-        }
-        
-        # Create temporary viewer to generate PDF without showing save dialog
-        viewer = InvoiceViewer(invoice_data, None)
-        pdf_path = viewer.generate_pdf(show_save_dialog=False)
-        
-        if pdf_path and os.path.exists(pdf_path):
-            # Send email
-            if send_invoice_email(recipient_email, invoice_number, pdf_path):
-                QMessageBox.information(
-                    self,
-                    "Success",
-                    f"Invoice has been sent to {recipient_email}",
-                    QMessageBox.StandardButton.Ok
-                )
-                # Clean up the temporary PDF file
-                try:
-                    os.remove(pdf_path)
-                except:
-                    pass
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Error",
-                    "Failed to send email. Please check your email settings and try again.",
-                    QMessageBox.StandardButton.Ok
-                )
-        else:
+        """Queue the invoice email; the outbox workers send it in the background"""
+        record = self.model.record(row)
+        invoice_number = record['invoice_number']
+        recipient_email = record['employee_email']
+
+        try:
+            pdf_bytes = cached_invoice_pdf(record)
+        except Exception as e:
+            print(f"Error generating invoice PDF: {e}")
             QMessageBox.warning(
                 self,
                 "Error",
                 "Failed to generate PDF. Please try again.",
                 QMessageBox.StandardButton.Ok
             )
+            return
+
+        if enqueue_invoice_email(record['invoice_id'], recipient_email, invoice_number, pdf_bytes) is None:
+            QMessageBox.warning(
+                self,
+                "Error",
+                "Failed to queue email. Please try again.",
+                QMessageBox.StandardButton.Ok
+            )
+            return
+        self.emails_queued[record['invoice_id']] += 1
+        self.update_email_status()
+
+    def email_finished(self, invoice_id, status, error):
+        # An outbox message was sent, or gave up after its last retry
+        if self.emails_queued[invoice_id] > 1:
+            self.emails_queued[invoice_id] -= 1
+        else:
+            del self.emails_queued[invoice_id]  # Counter ignores missing keys
+        if status == 'failed':
+            self.emails_failed += 1
+            print(f"Invoice {invoice_id} email failed: {error}")
+        if invoice_id is not None:
+            self.model.refresh_record(invoice_id)
+        self.update_email_status()
+
+    def update_email_status(self):
+        parts = []
+        queued = sum(self.emails_queued.values())
+        if queued:
+            parts.append(f"✉ {queued} email(s) queued")
+        if self.emails_failed:
+            parts.append(f"⚠ {self.emails_failed} failed")
+        self.email_status_label.setText("  ".join(parts))
+        self.email_status_label.setStyleSheet(
+            f"color: {'#ef4444' if self.emails_failed else '#64748b'}; "
+            "font-size: 14px; margin-left: 15px;")
+        self.email_status_label.setVisible(bool(parts))
 
     def mark_as_paid(self, row):
-        """Update invoice status from Draft to Paid"""
-        invoice_id = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+        """Update invoice status to Paid"""
+        invoice_id = self.model.record(row)['invoice_id']
         if update_invoice_status(invoice_id, 'paid'):
-            # Update the UI
-            self.setup_table()
+            # The new status gives the PDF a new cache key; drop the old file now
+            invalidate_invoice_pdf(invoice_id)
+            # Update just this row
+            self.model.refresh_record(invoice_id)
@@ -0,0 +1,157 @@
+"""Invoice PDF rendering, independent of Qt.
+
+Takes an invoice as returned by db.get_invoice / get_month_invoices
+(invoice_number, employee_name, issue_date, amount and bonus as Decimal,
+status) and draws it with reportlab. Safe to call from background threads
+and worker processes.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from io import BytesIO
+
+# Invoice fields that appear on the PDF, and a version to bump whenever the
+# layout changes; together they identify a rendered PDF (see pdf_cache.py)
+RENDERED_FIELDS = ('invoice_number', 'employee_name', 'issue_date', 'amount', 'bonus', 'status')
+LAYOUT_VERSION = 1
+
+STATUS_COLORS = {'paid': '#22c55e'}
+DEFAULT_STATUS_COLOR = '#f97316'
+
+def format_money(amount):
+    return f"${amount or Decimal('0'):,.2f}"
+
+def invoice_total(invoice):
+    return invoice['amount'] + (invoice['bonus'] or Decimal('0'))
+
+# In a document with many invoice pages, the static page content is drawn
+# once as a Form XObject and placed on each page with doForm, so each page
+# only adds the invoice's own fields. A single-invoice document draws it
+# directly: building the form costs more than it saves for one page.
+LAYOUT_FORM = "invoice_layout"
+
+def draw_layout(c):
+    """Draw the parts of the invoice page that are the same for every invoice"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+
+    width, height = letter
+
+    # Company Info
+    c.setFont("Helvetica-Bold", 24)
+    c.drawString(50, height - 50, "EMS Company")
+
+    c.setFont("Helvetica", 12)
+    c.drawString(50, height - 70, "123 Business Street")
+    c.drawString(50, height - 85, "City, State 12345")
+    c.drawString(50, height - 100, "Phone: (555) 123-4567")
+
+    # Invoice Title and Details
+    c.setFont("Helvetica-Bold", 32)
+    c.setFillColor(colors.HexColor('#0ea5e9'))
+    c.drawString(400, height - 50, "INVOICE")
+
+    c.setFillColor(colors.black)
+    c.setFont("Helvetica", 12)
+    c.drawString(400, height - 70, "Invoice #:")
+    c.drawString(400, height - 85, "Date:")
+
+    # Separator Line
+    c.line(50, height - 120, width - 50, height - 120)
+
+    # Bill To Section
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(50, height - 150, "Bill To:")
+
+    # Invoice Details
+    y = height - 220
+
+    # Headers
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "Description")
+    c.drawString(450, y, "Amount")
+
+    # Separator
+    y -= 10
+    c.line(50, y, width - 50, y)
+
+    # Items
+    y -= 25
+    c.setFont("Helvetica", 12)
+    c.drawString(50, y, "Base Salary")
+    y -= 25
+    c.drawString(50, y, "Bonus")
+
+    # Total Line
+    y -= 20
+    c.line(50, y, width - 50, y)
+
+    # Total and Status labels
+    y -= 25
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "Total")
+    y -= 50
+    c.drawString(50, y, "Status:")
+
+def define_layout(c):
+    """Add the layout form to the canvas's document"""
+    c.beginForm(LAYOUT_FORM)
+    draw_layout(c)
+    c.endForm()
+
+@lru_cache(maxsize=None)
+def label_width(text, font="Helvetica", size=12):
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    return stringWidth(text, font, size)
+
+def draw_invoice(c, invoice, shared_layout=False):
+    """Draw one invoice page onto a reportlab canvas.
+
+    Pass shared_layout=True when the canvas will hold many invoices, to
+    place the layout from a form shared by every page.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+
+    if shared_layout:
+        if not c.hasForm(LAYOUT_FORM):
+            define_layout(c)
+        c.doForm(LAYOUT_FORM)
+    else:
+        draw_layout(c)
+
+    width, height = letter
+    c.setFillColor(colors.black)
+    c.setFont("Helvetica", 12)
+
+    # Values following the "Invoice #:" and "Date:" labels
+    c.drawString(400 + label_width("Invoice #: "), height - 70, invoice['invoice_number'])
+    c.drawString(400 + label_width("Date: "), height - 85, invoice['issue_date'].strftime('%B %Y'))
+
+    # Bill To
+    c.drawString(50, height - 170, invoice['employee_name'])
+
+    # Amounts
+    y = height - 255
+    c.drawString(450, y, format_money(invoice['amount']))
+    y -= 25
+    c.drawString(450, y, format_money(invoice['bonus']))
+    y -= 45
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(450, y, format_money(invoice_total(invoice)))
+
+    # Status
+    y -= 50
+    c.setFont("Helvetica", 12)
+    c.setFillColor(colors.HexColor(STATUS_COLORS.get(invoice['status'], DEFAULT_STATUS_COLOR)))
+    c.drawString(100, y, invoice['status'].capitalize())
+
+def render_invoice_pdf(invoice):
+    """Render one invoice and return the PDF as bytes"""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    draw_invoice(c, invoice)
+    c.save()
+    return buffer.getvalue()
@@ -2,8 +2,7 @@ from PyQt6.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayou
                               QMessageBox, QHBoxLayout, QFrame)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
-from main_window import MainWindow
-from db import get_db_connection, close_db_connection
+from db import db_connection, close_db_connection
 from mysql.connector import Error
 import os
 import mysql.connector
@@ -21,13 +20,13 @@ class LoginWindow(QWidget):
 
     def verify_credentials(self, email, password):
         try:
-            connection = get_db_connection()
-            cursor = connection.cursor(dictionary=True)
-            query = "SELECT user_id, email FROM users WHERE email = %s AND password = %s"
-            cursor.execute(query, (email, password))
-            user = cursor.fetchone()
-            cursor.close()
-            return user
+            with db_connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                query = "SELECT user_id, email FROM users WHERE email = %s AND password = %s"
+                cursor.execute(query, (email, password))
+                user = cursor.fetchone()
+                cursor.close()
+                return user
         except Error as e:
             print(f"Error verifying credentials: {e}")
             QMessageBox.critical(
@@ -232,6 +231,9 @@ class LoginWindow(QWidget):
         if user:
             # Create tuple of user data with just user_id and email
             user_data = (user['user_id'], email, email)  # Using email as name since we don't have name field
+            # Imported here so the login window does not wait for the main
+            # window and its pages to load
+            from main_window import MainWindow
             self.dashboard = MainWindow(user_data)
             self.dashboard.show()
             self.hide()
@@ -1,9 +1,13 @@
 import sys
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QPalette, QColor
-from login import LoginWindow
+
+# The GUI is imported inside main(): worker processes started with "spawn"
+# re-import this module, and only need what their job imports.
 
 def main():
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QPalette, QColor
+    from login import LoginWindow
+
     print("Starting application...")
     app = QApplication(sys.argv)
     
@@ -1,18 +1,40 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QPushButton, QStackedWidget, QLabel)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QIcon
-from dashboard_view import DashboardView
-from user_management import UserManagement
-from invoice_management import InvoiceManagement
-from salary_sheet import SalarySheet
+import importlib
+from outbox import start_worker, stop_worker
+
+# Pages in navigation order as (module, class). Each module is imported and
+# its page built the first time the page is shown.
+PAGES = [
+    ("dashboard_view", "DashboardView"),
+    ("user_management", "UserManagement"),
+    ("invoice_management", "InvoiceManagement"),
+    ("salary_sheet", "SalarySheet")
+]
+
+# How long after a page is shown to build the next one in the background
+PREFETCH_DELAY_MS = 1500
 
 class MainWindow(QMainWindow):
-    def __init__(self, user_data):
+    def __init__(self, user_data, prefetch=True):
         super().__init__()
         self.user_data = user_data
+        self.prefetch = prefetch
+        self.pages = [None] * len(PAGES)
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.timeout.connect(self.prefetch_next_page)
         self.init_ui()
 
+        # Drain queued invoice emails for as long as the window is open
+        start_worker()
+
+    def closeEvent(self, event):
+        stop_worker()
+        super().closeEvent(event)
+
     def init_ui(self):
         self.setWindowTitle("Employee Management System")
         self.setGeometry(100, 100, 1400, 800)
@@ -80,12 +102,11 @@ class MainWindow(QMainWindow):
         sidebar_layout.addStretch()
         layout.addWidget(sidebar)
 
-        # Create stacked widget for different pages
+        # Create stacked widget for different pages. Each slot holds an empty
+        # placeholder until the page is first needed.
         self.stack = QStackedWidget()
-        self.stack.addWidget(DashboardView(self.user_data))
-        self.stack.addWidget(UserManagement(self.user_data))
-        self.stack.addWidget(InvoiceManagement(self.user_data))
-        self.stack.addWidget(SalarySheet(self.user_data))
+        for _ in PAGES:
+            self.stack.addWidget(QWidget())
         layout.addWidget(self.stack)
 
         # Connect buttons
@@ -95,8 +116,35 @@ class MainWindow(QMainWindow):
         # Set initial active button
         self.switch_page(0)
 
+    def page(self, index):
+        """Return the page at index, building it on first use"""
+        if self.pages[index] is None:
+            module_name, class_name = PAGES[index]
+            page_class = getattr(importlib.import_module(module_name), class_name)
+            page = page_class(self.user_data)
+            placeholder = self.stack.widget(index)
+            current = self.stack.currentIndex()
+            self.stack.insertWidget(index, page)
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.stack.setCurrentIndex(current)
+            self.pages[index] = page
+        return self.pages[index]
+
     def switch_page(self, index):
-        self.stack.setCurrentIndex(index)
+        self.stack.setCurrentWidget(self.page(index))
         for i, btn in enumerate(self.nav_buttons):
             btn.setProperty("Active", "true" if i == index else "false")
             btn.setStyleSheet("") # Force style refresh
+
+        # Once this page has settled, build the next one so it opens instantly
+        if self.prefetch:
+            self.prefetch_timer.start(PREFETCH_DELAY_MS)
+
+    def prefetch_next_page(self):
+        current = self.stack.currentIndex()
+        for offset in range(1, len(PAGES)):
+            index = (current + offset) % len(PAGES)
+            if self.pages[index] is None:
+                self.page(index)
+                return
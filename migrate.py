@@ -0,0 +1,203 @@
+"""Apply numbered schema migrations from DB_Schema/migrations.
+
+Usage:
+    python migrate.py status
+    python migrate.py apply [--to VERSION] [--lock-wait-timeout SECONDS]
+    python migrate.py rebuild-stats
+
+A fresh database is created from DB_Schema/database_schema.sql and then
+brought up to date with `python migrate.py apply`. Each migration is a file
+named NNN_description.sql; applied versions are recorded in the
+schema_migrations table. rebuild-stats recomputes the dashboard_stats
+summary table from the base tables.
+
+MySQL commits DDL implicitly, so a migration cannot be rolled back as a
+whole. Write migrations so they can be re-run after a partial failure:
+CREATE TABLE IF NOT EXISTS, and backfills as INSERT ... SELECT ... ON
+DUPLICATE KEY UPDATE. An ALTER TABLE ... ADD INDEX whose index already
+exists is skipped. Index builds in migrations should be written with
+`ALGORITHM=INPLACE, LOCK=NONE` so InnoDB builds them online; if MySQL
+cannot honour that it fails the statement instead of silently locking
+the table. The short lock_wait_timeout keeps a migration that is waiting
+for a metadata lock from stalling the application's queries behind it.
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+from mysql.connector import Error, errorcode
+from db import db_connection, close_db_connection, rebuild_dashboard_stats
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "DB_Schema", "migrations")
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+def load_migrations():
+    migrations = []
+    for file_name in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(file_name)
+        if not match:
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, file_name), encoding="utf-8") as f:
+            sql = f.read()
+        migrations.append({
+            'version': int(match.group(1)),
+            'name': match.group(2),
+            'sql': sql,
+            'checksum': hashlib.sha256(sql.encode("utf-8")).hexdigest()
+        })
+
+    versions = [m['version'] for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise SystemExit("Duplicate migration version numbers in " + MIGRATIONS_DIR)
+    return migrations
+
+def split_statements(sql):
+    # Split a script on semicolons, ignoring those inside quotes and comments
+    statements = []
+    current = []
+    quote = None
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if quote:
+            current.append(char)
+            if char == "\\":
+                current.append(sql[i + 1:i + 2])
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in ("'", '"', "`"):
+            quote = char
+            current.append(char)
+        elif sql.startswith("--", i) or char == "#":
+            end = sql.find("\n", i)
+            i = len(sql) if end == -1 else end
+            continue
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = len(sql) if end == -1 else end + 2
+            continue
+        elif char == ";":
+            statement = "".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+        else:
+            current.append(char)
+        i += 1
+
+    statement = "".join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def applied_migrations(cursor):
+    cursor.execute("SELECT version, name, checksum, applied_at FROM schema_migrations ORDER BY version")
+    return {version: {'name': name, 'checksum': checksum, 'applied_at': applied_at}
+            for version, name, checksum, applied_at in cursor.fetchall()}
+
+def status():
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        ensure_migrations_table(cursor)
+        applied = applied_migrations(cursor)
+        cursor.close()
+
+    for migration in load_migrations():
+        record = applied.get(migration['version'])
+        if record is None:
+            state = "pending"
+        elif record['checksum'] != migration['checksum']:
+            state = f"applied {record['applied_at']} (file changed since)"
+        else:
+            state = f"applied {record['applied_at']}"
+        print(f"{migration['version']:03d} {migration['name']:<40} {state}")
+
+def apply(target=None, lock_wait_timeout=10):
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        ensure_migrations_table(cursor)
+        applied = applied_migrations(cursor)
+
+        pending = [m for m in load_migrations()
+                   if m['version'] not in applied
+                   and (target is None or m['version'] <= target)]
+        if not pending:
+            print("Database is up to date.")
+            return True
+
+        cursor.execute("SET SESSION lock_wait_timeout = %s", (lock_wait_timeout,))
+        for migration in pending:
+            label = f"{migration['version']:03d}_{migration['name']}"
+            print(f"Applying {label}...")
+            for number, statement in enumerate(split_statements(migration['sql']), start=1):
+                try:
+                    cursor.execute(statement)
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                except Error as e:
+                    if e.errno == errorcode.ER_DUP_KEYNAME:
+                        # MySQL has no ADD INDEX IF NOT EXISTS; an ALTER TABLE
+                        # is atomic, so its indexes were added by an earlier run
+                        print(f"  statement {number}: index already exists, skipped")
+                        continue
+                    connection.rollback()
+                    print(f"Migration {label} failed at statement {number}: {e}")
+                    print("Statements before it (DDL in particular) may already be applied; "
+                          "fix the database or the migration before re-running.")
+                    cursor.close()
+                    return False
+
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (migration['version'], migration['name'], migration['checksum'])
+            )
+            connection.commit()
+
+        cursor.close()
+        print(f"Applied {len(pending)} migration(s).")
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage database schema migrations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="List migrations and whether they have been applied")
+    apply_parser = commands.add_parser("apply", help="Apply pending migrations in order")
+    apply_parser.add_argument("--to", type=int, dest="target",
+                              help="Stop after this migration version")
+    apply_parser.add_argument("--lock-wait-timeout", type=int, default=10,
+                              help="Seconds a statement may wait for a metadata lock (default 10)")
+    commands.add_parser("rebuild-stats", help="Recompute the dashboard_stats summary table")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "status":
+            status()
+            ok = True
+        elif args.command == "apply":
+            ok = apply(args.target, args.lock_wait_timeout)
+        else:
+            rows = rebuild_dashboard_stats()
+            ok = rows is not None
+            if ok:
+                print(f"Rebuilt dashboard_stats ({rows} rows).")
+    except Error as e:
+        print(f"Database error: {e}")
+        ok = False
+    finally:
+        close_db_connection()
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
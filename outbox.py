@@ -0,0 +1,294 @@
+"""Background email outbox.
+
+Invoice emails are queued in the email_outbox table with
+enqueue_invoice_email() and sent by a pool of worker threads, each holding
+its own SMTP session. Sends are rate limited per provider (the recipient's
+email domain) and failed attempts are retried with exponential backoff.
+When an invoice email is sent, a draft invoice is marked 'sent'.
+
+Settings (environment):
+    EMAIL_WORKERS           worker threads (default 4)
+    EMAIL_MAX_ATTEMPTS      attempts before a message is marked failed (default 5)
+    EMAIL_BACKOFF_SECONDS   delay after the first failure, doubled each time (default 30)
+    EMAIL_RATE_LIMIT        messages per minute per provider (default 60)
+    EMAIL_RATE_LIMITS       per-provider overrides, e.g. "gmail.com=20,outlook.com=30"
+
+Run `python outbox.py` to drain the outbox without the GUI.
+"""
+import os
+import random
+import threading
+import time
+from mysql.connector import Error
+from db import db_connection, apply_stat_deltas, invoice_stat_deltas, close_db_connection
+from email_utils import Mailer
+from pdf_cache import invalidate_invoice_pdf
+
+WORKERS = int(os.getenv('EMAIL_WORKERS', 4))
+MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 5))
+BACKOFF_SECONDS = float(os.getenv('EMAIL_BACKOFF_SECONDS', 30))
+BACKOFF_MAX_SECONDS = 3600
+# How long a claimed message stays reserved for the worker sending it
+LEASE_SECONDS = 300
+# How often idle workers look for due retries without being woken
+POLL_SECONDS = 10
+
+def parse_rate_limits(spec):
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        provider, _, per_minute = item.partition('=')
+        limits[provider.strip().lower()] = float(per_minute)
+    return limits
+
+
+class RateLimiter:
+    """Spaces sends to each provider evenly to stay under a per-minute limit."""
+
+    def __init__(self, default_per_minute=None, limits=None):
+        self.default_per_minute = default_per_minute or float(os.getenv('EMAIL_RATE_LIMIT', 60))
+        self.limits = limits if limits is not None else parse_rate_limits(os.getenv('EMAIL_RATE_LIMITS', ''))
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, provider):
+        # Reserve the provider's next send slot; returns seconds to wait for it
+        interval = 60.0 / self.limits.get(provider, self.default_per_minute)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(provider, now))
+            self._next_slot[provider] = slot + interval
+        return slot - now
+
+
+def provider_of(email):
+    return email.rpartition('@')[2].lower()
+
+def backoff_delay(attempts):
+    # 1st retry after BACKOFF_SECONDS, then doubling, with +/-20% jitter
+    delay = min(BACKOFF_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+def enqueue_invoice_email(invoice_id, recipient_email, invoice_number, pdf_bytes):
+    # Returns the outbox_id, or None on error
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                INSERT INTO email_outbox (invoice_id, recipient_email, invoice_number, pdf)
+                VALUES (%s, %s, %s, %s)
+            """, (invoice_id, recipient_email, invoice_number, pdf_bytes))
+            outbox_id = cursor.lastrowid
+            connection.commit()
+            cursor.close()
+    except Error as e:
+        print(f"Error queueing email for invoice {invoice_number}: {e}")
+        return None
+
+    if _worker is not None:
+        _worker.wake()
+    return outbox_id
+
+def claim_next():
+    # Lease the next due message to this worker; returns its row dict or None
+    with db_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT outbox_id, invoice_id, recipient_email, invoice_number, pdf, attempts
+                FROM email_outbox
+                WHERE status IN ('pending', 'sending') AND next_attempt_at <= NOW()
+                ORDER BY next_attempt_at, outbox_id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            """)
+            message = cursor.fetchone()
+            if message is None:
+                connection.rollback()
+                return None
+            cursor.execute("""
+                UPDATE email_outbox
+                SET status = 'sending', attempts = attempts + 1,
+                    next_attempt_at = NOW() + INTERVAL %s SECOND
+                WHERE outbox_id = %s
+            """, (LEASE_SECONDS, message['outbox_id']))
+            connection.commit()
+            message['attempts'] += 1
+            return message
+        finally:
+            cursor.close()
+
+def mark_sent(message):
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("""
+            UPDATE email_outbox
+            SET status = 'sent', sent_at = NOW(), last_error = NULL, pdf = ''
+            WHERE outbox_id = %s
+        """, (message['outbox_id'],))
+
+        # Sending a draft invoice moves it to 'sent'; paid or cancelled
+        # invoices keep their status
+        invoice_id = message['invoice_id']
+        if invoice_id is not None:
+            before = invoice_stat_deltas(cursor, invoice_id, -1)
+            cursor.execute("""
+                UPDATE invoices SET status = 'sent'
+                WHERE invoice_id = %s AND status = 'draft'
+            """, (invoice_id,))
+            if cursor.rowcount:
+                apply_stat_deltas(cursor, before)
+                apply_stat_deltas(cursor, invoice_stat_deltas(cursor, invoice_id, 1))
+        connection.commit()
+        cursor.close()
+    if invoice_id is not None:
+        invalidate_invoice_pdf(invoice_id)
+
+def mark_failed(message, error):
+    # Schedule a retry, or give up after MAX_ATTEMPTS; returns the new status
+    status = 'failed' if message['attempts'] >= MAX_ATTEMPTS else 'pending'
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("""
+            UPDATE email_outbox
+            SET status = %s, last_error = %s,
+                next_attempt_at = NOW() + INTERVAL %s SECOND
+            WHERE outbox_id = %s
+        """, (status, str(error)[:1000], int(backoff_delay(message['attempts'])),
+              message['outbox_id']))
+        connection.commit()
+        cursor.close()
+    return status
+
+
+class OutboxWorker:
+    """Pool of threads draining email_outbox.
+
+    Listeners registered with add_listener() are called from the worker
+    threads as listener(invoice_id, status, error) after each message is
+    sent ('sent') or given up on ('failed').
+    """
+
+    def __init__(self, workers=None, rate_limiter=None, mailer_factory=Mailer):
+        self.workers = workers or WORKERS
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.mailer_factory = mailer_factory
+        self._listeners = []
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Condition()
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def start(self):
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"outbox-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self.wake()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        # New messages were queued; idle workers look again now
+        with self._wake:
+            self._wake.notify_all()
+
+    def _notify(self, invoice_id, status, error=None):
+        for listener in list(self._listeners):
+            try:
+                listener(invoice_id, status, error)
+            except Exception as e:
+                print(f"Outbox listener error: {e}")
+
+    def _run(self):
+        mailer = None
+        while not self._stop.is_set():
+            try:
+                message = claim_next()
+            except Error as e:
+                print(f"Error claiming outbox message: {e}")
+                message = None
+
+            if message is None:
+                # Nothing due: drop the SMTP session rather than hold it idle
+                if mailer is not None:
+                    mailer.close()
+                    mailer = None
+                with self._wake:
+                    self._wake.wait(POLL_SECONDS)
+                continue
+
+            delay = self.rate_limiter.reserve(provider_of(message['recipient_email']))
+            if delay > 0 and self._stop.wait(delay):
+                break  # The lease expires and another worker retries it
+
+            if mailer is None:
+                mailer = self.mailer_factory()
+            try:
+                mailer.send_invoice(message['recipient_email'],
+                                    message['invoice_number'], message['pdf'])
+            except Exception as e:
+                print(f"Error sending invoice {message['invoice_number']} "
+                      f"(attempt {message['attempts']}): {e}")
+                mailer.close()
+                mailer = None
+                try:
+                    status = mark_failed(message, e)
+                except Error as db_error:
+                    print(f"Error recording failed send: {db_error}")
+                    continue
+                if status == 'failed':
+                    self._notify(message['invoice_id'], 'failed', str(e))
+                continue
+
+            try:
+                mark_sent(message)
+            except Error as e:
+                # The mail went out; the lease expiring would send it again
+                print(f"Error recording sent invoice {message['invoice_number']}: {e}")
+                continue
+            self._notify(message['invoice_id'], 'sent')
+
+        if mailer is not None:
+            mailer.close()
+
+
+_worker = None
+
+def start_worker():
+    global _worker
+    if _worker is None:
+        _worker = OutboxWorker()
+        _worker.start()
+    return _worker
+
+def get_worker():
+    return _worker
+
+def stop_worker():
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
+
+if __name__ == "__main__":
+    worker = start_worker()
+    worker.add_listener(lambda invoice_id, status, error: print(f"invoice {invoice_id}: {status}"))
+    print(f"Draining email outbox with {worker.workers} workers (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_worker()
+        close_db_connection()
@@ -0,0 +1,164 @@
+"""On-disk cache of rendered invoice PDFs.
+
+Files are named <invoice_id>-<digest>.pdf, where the digest covers every
+field the renderer draws plus its layout version, so an invoice whose data
+changes simply misses and is rendered again. invalidate(invoice_id) lets
+callers drop an invoice's outdated files early rather than waiting for
+eviction. Total size is bounded;
+the least recently used files are evicted first.
+
+Settings (environment):
+    PDF_CACHE_DIR       cache directory (default ~/.cache/ems/invoices)
+    PDF_CACHE_MAX_MB    size limit in MB, 0 disables the cache (default 200)
+"""
+import hashlib
+import os
+import threading
+from invoice_renderer import render_invoice_pdf, RENDERED_FIELDS, LAYOUT_VERSION
+
+
+class PdfCache:
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.getenv('PDF_CACHE_DIR') or os.path.join(
+            os.path.expanduser('~'), '.cache', 'ems', 'invoices')
+        if max_bytes is None:
+            max_bytes = float(os.getenv('PDF_CACHE_MAX_MB', 200)) * 1024 * 1024
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._size = None  # Bytes on disk, counted on first write
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def path(self, invoice):
+        digest = hashlib.sha256(repr(
+            (LAYOUT_VERSION,) + tuple(str(invoice[field]) for field in RENDERED_FIELDS)
+        ).encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{invoice['invoice_id']}-{digest}.pdf")
+
+    def get(self, invoice):
+        # Returns the cached PDF bytes, or None on a miss
+        path = self.path(invoice)
+        try:
+            with open(path, 'rb') as f:
+                pdf_bytes = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass  # Read-only cache: still a hit, only the LRU order goes stale
+        with self._lock:
+            self.hits += 1
+        return pdf_bytes
+
+    def put(self, invoice, pdf_bytes):
+        path = self.path(invoice)
+        # Written under a unique name and renamed into place, so concurrent
+        # writers and readers never see a partial file
+        part_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(part_path, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(part_path, path)
+        except OSError as e:
+            print(f"Error writing PDF cache: {e}")
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(pdf_bytes)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def invalidate(self, invoice_id):
+        # Drop every cached version of the invoice
+        prefix = f"{invoice_id}-"
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.startswith(prefix)]
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            with self._lock:
+                if self._size is not None:
+                    self._size -= size
+
+    def clear(self):
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.endswith('.pdf'):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+        with self._lock:
+            self._size = None
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'bytes': self._size}
+
+    def _files(self):
+        try:
+            return [(entry.path, entry.stat()) for entry in os.scandir(self.directory)
+                    if entry.name.endswith('.pdf')]
+        except OSError:
+            return []
+
+    def _scan_size(self):
+        return sum(stat.st_size for _, stat in self._files())
+
+    def _evict(self):
+        # Remove least recently used files until 90% of the limit. Other
+        # processes share the directory, so the size is recounted here.
+        files = sorted(self._files(), key=lambda item: item[1].st_mtime)
+        size = sum(stat.st_size for _, stat in files)
+        target = self.max_bytes * 0.9
+        for path, stat in files:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= stat.st_size
+            self.evictions += 1
+        self._size = size
+
+pdf_cache = PdfCache()
+
+def cached_invoice_pdf(invoice):
+    """Return the invoice's PDF bytes, rendering it only on a cache miss"""
+    if not pdf_cache.enabled or invoice.get('invoice_id') is None:
+        return render_invoice_pdf(invoice)
+    pdf_bytes = pdf_cache.get(invoice)
+    if pdf_bytes is None:
+        pdf_bytes = render_invoice_pdf(invoice)
+        pdf_cache.put(invoice, pdf_bytes)
+    return pdf_bytes
+
+def invalidate_invoice_pdf(invoice_id):
+    if pdf_cache.enabled:
+        pdf_cache.invalidate(invoice_id)
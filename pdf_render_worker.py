@@ -0,0 +1,13 @@
+"""Job run by the bulk email PDF render processes (see bulk_email.py).
+
+Kept apart from bulk_email so a spawned worker process only imports the
+renderer and the PDF cache, not the outbox, email and database modules.
+"""
+
+def render_invoice(invoice):
+    # Returns (pdf_bytes, None) or (None, error)
+    try:
+        from pdf_cache import cached_invoice_pdf
+        return cached_invoice_pdf(invoice), None
+    except Exception as e:
+        return None, str(e)
@@ -1,11 +1,184 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
-                           QTableWidgetItem, QPushButton, QHeaderView,
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                           QAbstractItemView, QPushButton, QHeaderView,
                            QMessageBox, QMenu, QFrame, QDialog, QFormLayout,
                            QLineEdit, QDateEdit, QLabel, QComboBox)
-from PyQt6.QtCore import Qt, QDate, QDateTime
-from PyQt6.QtGui import QColor, QIcon, QFont, QAction
+from PyQt6.QtCore import Qt, QDate, QTimer
 from mysql.connector import Error
-from db import get_db_connection
+from db import (db_connection, apply_stat_deltas, salary_stat_deltas,
+                get_all_employees, invalidate_cache)
+from data_loader import DataLoader
+from table_models import PagedTableModel
+from table_delegates import ActionButtonDelegate
+
+SALARY_ROW_QUERY = """
+    SELECT s.salary_id, s.employee_id, CONCAT(e.first_name, ' ', e.last_name) as employee_name,
+           s.base_salary, s.bonus, s.payment_date, s.payment_status, s.created_at
+    FROM salaries s
+    JOIN employees e ON s.employee_id = e.employee_id
+"""
+
+# Sort orders offered by the sheet. Each is keyset-paged on
+# (column, salary_id) and backed by an index (migrations 002 and 005).
+SALARY_SORT_COLUMNS = {
+    'salary_id': 's.salary_id',
+    'base_salary': 's.base_salary',
+    'payment_date': 's.payment_date'
+}
+
+# Below this estimate the sheet shows an exact COUNT(*) instead
+EXACT_COUNT_LIMIT = 5000
+
+def salary_filter_conditions(filters):
+    # WHERE conditions and parameters for the sheet's filters:
+    # employee_id, month_from / month_to (dates, whole months) and status
+    conditions, params = [], []
+    if filters.get('employee_id') is not None:
+        conditions.append("s.employee_id = %s")
+        params.append(filters['employee_id'])
+    if filters.get('month_from'):
+        conditions.append("s.payment_date >= %s")
+        params.append(filters['month_from'].replace(day=1))
+    if filters.get('month_to'):
+        month_to = filters['month_to'].replace(day=1)
+        if month_to.month == 12:
+            month_end = month_to.replace(year=month_to.year + 1, month=1)
+        else:
+            month_end = month_to.replace(month=month_to.month + 1)
+        conditions.append("s.payment_date < %s")
+        params.append(month_end)
+    if filters.get('status'):
+        conditions.append("s.payment_status = %s")
+        params.append(filters['status'])
+    return conditions, params
+
+def where_clause(conditions):
+    return (" WHERE " + " AND ".join(conditions)) if conditions else ""
+
+# Run on a DataLoader worker thread
+def fetch_salary_page(filters, sort, descending, after, limit):
+    # One page of salary rows matching filters, ordered by (sort, salary_id).
+    # `after` is the (sort value, salary_id) of the last row already loaded.
+    conditions, params = salary_filter_conditions(filters)
+    column = SALARY_SORT_COLUMNS[sort]
+    op = '<' if descending else '>'
+    if after is not None:
+        if sort == 'salary_id':
+            conditions.append(f"s.salary_id {op} %s")
+            params.append(after[1])
+        else:
+            # Bounded range on the sort column so its index can seek to the page
+            conditions.append(f"{column} {op}= %s AND ({column} {op} %s OR s.salary_id {op} %s)")
+            params += [after[0], after[0], after[1]]
+    direction = 'DESC' if descending else 'ASC'
+    order = f"s.salary_id {direction}" if sort == 'salary_id' else f"{column} {direction}, s.salary_id {direction}"
+
+    with db_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(SALARY_ROW_QUERY + where_clause(conditions)
+                       + f" ORDER BY {order} LIMIT %s", params + [limit])
+        rows = cursor.fetchall()
+        cursor.close()
+    return rows
+
+def fetch_salary_row(salary_id, filters):
+    # The row for salary_id, or None if it is gone or no longer matches filters
+    conditions, params = salary_filter_conditions(filters)
+    with db_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(SALARY_ROW_QUERY + where_clause(["s.salary_id = %s"] + conditions),
+                       [salary_id] + params)
+        row_data = cursor.fetchone()
+        cursor.close()
+    return row_data
+
+def estimate_salary_count(filters):
+    # Number of rows matching filters as (count, exact). Starts from the
+    # optimizer's estimate - table statistics when unfiltered, EXPLAIN
+    # otherwise - and only counts exactly when that is small.
+    conditions, params = salary_filter_conditions(filters)
+    with db_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        if not conditions:
+            cursor.execute("""
+                SELECT TABLE_ROWS AS row_count
+                FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'salaries'
+            """)
+            row = cursor.fetchone()
+            estimate = int(row['row_count'] or 0) if row else 0
+        else:
+            cursor.execute("EXPLAIN SELECT 1 FROM salaries s" + where_clause(conditions), params)
+            plan = cursor.fetchall()[0]
+            estimate = int((plan['rows'] or 0) * float(plan['filtered'] or 100) / 100)
+
+        exact = estimate <= EXACT_COUNT_LIMIT
+        if exact:
+            cursor.execute("SELECT COUNT(*) AS row_count FROM salaries s" + where_clause(conditions), params)
+            estimate = cursor.fetchone()['row_count']
+        cursor.close()
+    return estimate, exact
+
+class SalaryTableModel(PagedTableModel):
+    headers = ["ID", "Employee", "Base Salary", "Bonus", "Payment Date", "Status", "Created At", "Actions"]
+
+    # Header column -> sort order
+    sort_columns = {0: 'salary_id', 2: 'base_salary', 4: 'payment_date'}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.filters = {}
+        self.sort_key = 'salary_id'
+        self.descending = True
+
+    def set_filters(self, filters):
+        self.filters = dict(filters)
+        self.reload()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # Called by the view when a header is clicked; sorting happens in SQL
+        if column not in self.sort_columns:
+            return
+        sort_key = self.sort_columns[column]
+        descending = order == Qt.SortOrder.DescendingOrder
+        if (sort_key, descending) == (self.sort_key, self.descending):
+            return
+        self.sort_key = sort_key
+        self.descending = descending
+        self.reload()
+
+    def fetch_page(self, after, limit):
+        return fetch_salary_page(self.filters, self.sort_key, self.descending, after, limit)
+
+    def cursor_key(self, record):
+        return (record[self.sort_key], record['salary_id'])
+
+    def record_key(self, record):
+        return record['salary_id']
+
+    def fetch_record(self, salary_id):
+        return fetch_salary_row(salary_id, self.filters)
+
+    def display(self, record, column):
+        if column == 0:
+            return str(record['salary_id'])
+        if column == 1:
+            return record['employee_name']
+        if column == 2:
+            return f"${record['base_salary']:,.2f}"
+        if column == 3:
+            return f"${record['bonus'] or 0:,.2f}"
+        if column == 4:
+            return record['payment_date'].strftime("%Y-%m-%d")
+        if column == 5:
+            return record['payment_status']
+        if column == 6:
+            return record['created_at'].strftime("%Y-%m-%d")
+        return None
+
+    def foreground(self, record, column):
+        if column == 5:
+            return "#22c55e" if record['payment_status'] == "paid" else "#ef4444"
+        return None
 
 class SalarySheet(QWidget):
     def __init__(self, user_data):
@@ -39,6 +212,12 @@ class SalarySheet(QWidget):
         """)
         header_layout.addWidget(title)
 
+        # Shown while salaries are being fetched in the background
+        self.loading_label = QLabel("Loading...")
+        self.loading_label.setStyleSheet("color: #64748b; font-size: 14px; border: none;")
+        self.loading_label.hide()
+        header_layout.addWidget(self.loading_label)
+
         # Add New Salary Button
         new_salary_btn = QPushButton("+ New Salary")
         new_salary_btn.setStyleSheet("""
@@ -58,16 +237,79 @@ class SalarySheet(QWidget):
         header_layout.addWidget(new_salary_btn)
         layout.addWidget(header)
 
+        # Filters, applied in SQL
+        filters = QFrame()
+        filters.setStyleSheet("""
+            QFrame {
+                background-color: white;
+                border: 1px solid #e2e8f0;
+                border-radius: 8px;
+            }
+            QLabel {
+                border: none;
+                color: #475569;
+                font-weight: 500;
+            }
+            QComboBox, QDateEdit {
+                padding: 6px;
+                border: 1px solid #e2e8f0;
+                border-radius: 6px;
+                background: white;
+                min-width: 120px;
+            }
+        """)
+        filters_layout = QHBoxLayout(filters)
+        filters_layout.setContentsMargins(20, 12, 20, 12)
+        filters_layout.setSpacing(12)
+
+        # Employees are loaded in the background when the page is shown
+        self.employee_filter = QComboBox()
+        self.employee_filter.addItem("All employees", None)
+        self.employee_filter.setMinimumWidth(200)
+        self.employees_loaded = False
+
+        # Month range; the minimum date stands for "no limit"
+        self.month_from = self.create_month_edit()
+        self.month_to = self.create_month_edit()
+
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("All statuses", None)
+        self.status_filter.addItem("Pending", "pending")
+        self.status_filter.addItem("Paid", "paid")
+
+        for label, widget in [("Employee:", self.employee_filter), ("From:", self.month_from),
+                              ("To:", self.month_to), ("Status:", self.status_filter)]:
+            filters_layout.addWidget(QLabel(label))
+            filters_layout.addWidget(widget)
+        filters_layout.addStretch()
+
+        # Row count for the current filters
+        self.count_label = QLabel()
+        self.count_loaded = False
+        self.count_label.setStyleSheet("color: #64748b; font-size: 14px; border: none;")
+        filters_layout.addWidget(self.count_label)
+        layout.addWidget(filters)
+
+        # Date edits fire on every keystroke, so filter changes are batched
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(300)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        self.employee_filter.currentIndexChanged.connect(self.filter_timer.start)
+        self.status_filter.currentIndexChanged.connect(self.filter_timer.start)
+        self.month_from.dateChanged.connect(self.filter_timer.start)
+        self.month_to.dateChanged.connect(self.filter_timer.start)
+
         # Table
-        self.table = QTableWidget()
+        self.table = QTableView()
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 1px solid #e2e8f0;
                 border-radius: 8px;
                 gridline-color: #e2e8f0;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
             }
             QHeaderView::section {
@@ -80,18 +322,38 @@ class SalarySheet(QWidget):
             }
         """)
         layout.addWidget(self.table)
+
+        self.loader = DataLoader(self)
+        self.model = SalaryTableModel(self)
+        self.model.loader.busy_changed.connect(self.loading_label.setVisible)
+        self.model.load_failed.connect(self.show_load_error)
+        self.table.setModel(self.model)
+
+        # The "⋮" button is painted by a delegate rather than a widget per row
+        action_delegate = ActionButtonDelegate(self.table)
+        action_delegate.clicked.connect(self.show_action_menu)
+        self.table.setItemDelegateForColumn(7, action_delegate)
+        self.action_menu = None
         self.setup_table()
+        self.apply_filters()
 
-    def setup_table(self):
-        headers = ["ID", "Employee", "Base Salary", "Bonus", "Payment Date", "Status", "Created At", "Actions"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+    def create_month_edit(self):
+        month_edit = QDateEdit()
+        month_edit.setDisplayFormat("MMM yyyy")
+        month_edit.setCalendarPopup(True)
+        month_edit.setMinimumDate(QDate(2000, 1, 1))
+        month_edit.setSpecialValueText("Any")
+        month_edit.setDate(month_edit.minimumDate())
+        return month_edit
 
+    def setup_table(self):
         # Set row and header heights
         self.table.verticalHeader().setDefaultSectionSize(60)
         self.table.horizontalHeader().setFixedHeight(50)
         self.table.verticalHeader().setVisible(False)
         self.table.setShowGrid(True)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
 
         # Make table responsive
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
@@ -112,163 +374,153 @@ class SalarySheet(QWidget):
         for col, width in column_widths.items():
             self.table.setColumnWidth(col, width)
 
-        try:
-            connection = get_db_connection()
-            cursor = connection.cursor()
-
-            query = """
-                SELECT s.salary_id, CONCAT(e.first_name, ' ', e.last_name) as employee_name,
-                       s.base_salary, s.bonus, s.payment_date, s.payment_status, s.created_at
-                FROM salaries s
-                JOIN employees e ON s.employee_id = e.employee_id
-                ORDER BY s.salary_id DESC
-            """
-            cursor.execute(query)
-            rows = cursor.fetchall()
-
-            self.table.setRowCount(len(rows))
-
-            for row_idx, row_data in enumerate(rows):
-                bg_color = "#f8fafc" if row_idx % 2 else "white"
-
-                for col, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    item.setBackground(QColor(bg_color))
-
-                    # Format currency for salary and bonus
-                    if col in [2, 3]:  # base_salary and bonus columns
-                        item.setText(f"${value:,.2f}")
-                    
-                    # Format dates
-                    elif col in [4, 6]:  # payment_date and created_at
-                        if isinstance(value, str):
-                            item.setText(value)
-                        else:
-                            item.setText(value.strftime("%Y-%m-%d"))
-                    
-                    # Color code status
-                    elif col == 5:  # status column
-                        if value.lower() == "paid":
-                            item.setForeground(QColor("#22c55e"))
-                        else:
-                            item.setForeground(QColor("#ef4444"))
-
-                    self.table.setItem(row_idx, col, item)
-
-                # Add action buttons
-                action_widget = self.create_action_widget(row_idx)
-                self.table.setCellWidget(row_idx, len(row_data), action_widget)
-
-            cursor.close()
-            connection.close()
-
-        except Error as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"Failed to fetch salary data: {str(e)}",
-                QMessageBox.StandardButton.Ok
-            )
-
-    def create_action_widget(self, row):
-        action_widget = QWidget()
-        action_layout = QHBoxLayout(action_widget)
-        action_layout.setContentsMargins(0, 0, 0, 0)
-        action_layout.setSpacing(0)
-
-        action_btn = QPushButton("⋮")
-        action_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #64748b;
-                border: none;
-                padding: 0px;
-                font-size: 20px;
-                font-weight: bold;
-                min-width: 24px;
-                max-width: 24px;
-                min-height: 24px;
-                max-height: 24px;
-                text-align: center;
-                line-height: 24px;
-            }
-            QPushButton:hover {
-                background-color: #f1f5f9;
-                border-radius: 4px;
-            }
-        """)
-        action_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-
-        menu = QMenu(self)
-        menu.setStyleSheet("""
-            QMenu {
-                background-color: white;
-                border: 1px solid #e2e8f0;
-                border-radius: 8px;
-                padding: 8px 0px;
-            }
-            QMenu::item {
-                padding: 8px 24px;
-                font-size: 14px;
-            }
-            QMenu::item:selected {
-                background-color: #f1f5f9;
-                color: #1e293b;
-            }
-        """)
-
-        edit_action = QAction("✎ Edit", self)
-        delete_action = QAction("🗑 Delete", self)
-        mark_paid_action = QAction("✓ Mark as Paid", self)
-
-        edit_action.triggered.connect(lambda checked, r=row: self.edit_salary(r))
-        delete_action.triggered.connect(lambda checked, r=row: self.delete_salary(r))
-        mark_paid_action.triggered.connect(lambda checked, r=row: self.mark_as_paid(r))
-
-        menu.addAction(edit_action)
-        menu.addAction(mark_paid_action)
-        menu.addAction(delete_action)
-
-        action_btn.clicked.connect(lambda checked, b=action_btn, m=menu: self.show_action_menu(b, m))
-
-        action_layout.addStretch()
-        action_layout.addWidget(action_btn)
-        action_layout.addStretch()
-
-        return action_widget
+        # Header clicks sort in SQL (ID, Base Salary and Payment Date);
+        # start from the newest salary, as the sheet always has
+        self.table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.DescendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.sort_changed)
+
+    def sort_changed(self, column, order):
+        # Keep the indicator on the active sort when an unsortable column is clicked
+        if column not in self.model.sort_columns:
+            active = next(c for c, key in self.model.sort_columns.items() if key == self.model.sort_key)
+            self.table.horizontalHeader().setSortIndicator(
+                active, Qt.SortOrder.DescendingOrder if self.model.descending else Qt.SortOrder.AscendingOrder)
+
+    def current_filters(self):
+        def month(edit):
+            date = edit.date()
+            return None if date == edit.minimumDate() else date.toPyDate()
+        return {
+            'employee_id': self.employee_filter.currentData(),
+            'month_from': month(self.month_from),
+            'month_to': month(self.month_to),
+            'status': self.status_filter.currentData()
+        }
 
-    def show_action_menu(self, button, menu):
-        pos = button.mapToGlobal(button.rect().bottomLeft())
-        menu.exec(pos)
+    def apply_filters(self):
+        self.model.set_filters(self.current_filters())
+        self.count_label.setText("")
+        self.update_count()
+
+    def update_count(self):
+        self.count_loaded = False
+        self.loader.submit(estimate_salary_count, self.model.filters,
+                           on_result=self.show_count, channel="count")
+
+    def show_count(self, result):
+        count, exact = result
+        self.count_label.setText(f"{count:,} records" if exact else f"≈ {count:,} records")
+        self.count_loaded = True
+
+    def load_employees(self):
+        self.loader.submit(get_all_employees, on_result=self.set_employees, channel="employees")
+
+    def set_employees(self, employees):
+        selected = self.employee_filter.currentData()
+        self.employee_filter.blockSignals(True)
+        self.employee_filter.clear()
+        self.employee_filter.addItem("All employees", None)
+        for employee in employees:
+            self.employee_filter.addItem(employee['full_name'], employee['employee_id'])
+        self.employee_filter.setCurrentIndex(max(self.employee_filter.findData(selected), 0))
+        self.employee_filter.blockSignals(False)
+        self.employees_loaded = True
+
+    def show_load_error(self, error):
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to fetch salary data: {str(error)}",
+            QMessageBox.StandardButton.Ok
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.employees_loaded:
+            self.load_employees()
+        if not self.count_loaded:
+            self.update_count()
+        self.model.resume_loading()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Navigating away: drop loads the user is no longer waiting for. The
+        # count and employee list are requested again when the page is shown.
+        if not event.spontaneous():
+            self.model.cancel_loading()
+            self.loader.cancel()
+
+    def refresh_row(self, salary_id):
+        """Update, insert or remove the single row for salary_id"""
+        self.model.refresh_record(salary_id)
+        self.update_count()
+
+    def show_action_menu(self, row, pos):
+        if self.action_menu is None:
+            # One menu for the whole table, built the first time it is needed
+            self.action_menu = QMenu(self)
+            self.action_menu.setStyleSheet("""
+                QMenu {
+                    background-color: white;
+                    border: 1px solid #e2e8f0;
+                    border-radius: 8px;
+                    padding: 8px 0px;
+                }
+                QMenu::item {
+                    padding: 8px 24px;
+                    font-size: 14px;
+                }
+                QMenu::item:selected {
+                    background-color: #f1f5f9;
+                    color: #1e293b;
+                }
+            """)
+
+        menu = self.action_menu
+        menu.clear()
+        edit_action = menu.addAction("✎ Edit")
+        mark_paid_action = menu.addAction("✓ Mark as Paid")
+        delete_action = menu.addAction("🗑 Delete")
+
+        chosen = menu.exec(pos)
+        if chosen == edit_action:
+            self.edit_salary(row)
+        elif chosen == mark_paid_action:
+            self.mark_as_paid(row)
+        elif chosen == delete_action:
+            self.delete_salary(row)
 
     def save_salary(self, employee_id, base_salary, bonus, payment_date, status, salary_id=None):
         try:
-            connection = get_db_connection()
-            cursor = connection.cursor()
-
-            if salary_id:  # Update existing salary
-                query = """
-                    UPDATE salaries 
-                    SET employee_id = %s, base_salary = %s, bonus = %s,
-                        payment_date = %s, payment_status = %s
-                    WHERE salary_id = %s
-                """
-                cursor.execute(query, (employee_id, base_salary, bonus, 
-                                    payment_date, status, salary_id))
-            else:  # Insert new salary
-                query = """
-                    INSERT INTO salaries 
-                    (employee_id, base_salary, bonus, payment_date, payment_status)
-                    VALUES (%s, %s, %s, %s, %s)
-                """
-                cursor.execute(query, (employee_id, base_salary, bonus, 
-                                    payment_date, status))
-
-            connection.commit()
-            cursor.close()
-            connection.close()
-            return True
+            with db_connection() as connection:
+                cursor = connection.cursor()
+
+                if salary_id:  # Update existing salary
+                    apply_stat_deltas(cursor, salary_stat_deltas(cursor, salary_id, -1))
+                    query = """
+                        UPDATE salaries 
+                        SET employee_id = %s, base_salary = %s, bonus = %s,
+                            payment_date = %s, payment_status = %s
+                        WHERE salary_id = %s
+                    """
+                    cursor.execute(query, (employee_id, base_salary, bonus, 
+                                        payment_date, status, salary_id))
+                else:  # Insert new salary
+                    query = """
+                        INSERT INTO salaries 
+                        (employee_id, base_salary, bonus, payment_date, payment_status)
+                        VALUES (%s, %s, %s, %s, %s)
+                    """
+                    cursor.execute(query, (employee_id, base_salary, bonus, 
+                                        payment_date, status))
+                    salary_id = cursor.lastrowid
+
+                apply_stat_deltas(cursor, salary_stat_deltas(cursor, salary_id, 1))
+                connection.commit()
+                cursor.close()
+            invalidate_cache('salaries')
+            return salary_id
 
         except Error as e:
             QMessageBox.critical(
@@ -277,7 +529,7 @@ class SalarySheet(QWidget):
                 f"Failed to save salary: {str(e)}",
                 QMessageBox.StandardButton.Ok
             )
-            return False
+            return None
 
     def show_salary_dialog(self, salary_data=None):
         dialog = QDialog(self)
@@ -327,17 +579,8 @@ class SalarySheet(QWidget):
 
         # Employee selection
         employee_combo = QComboBox()
-        try:
-            connection = get_db_connection()
-            cursor = connection.cursor()
-            cursor.execute("SELECT employee_id, CONCAT(first_name, ' ', last_name) FROM employees")
-            employees = cursor.fetchall()
-            for emp_id, name in employees:
-                employee_combo.addItem(name, emp_id)
-            cursor.close()
-            connection.close()
-        except Error as e:
-            print(f"Error fetching employees: {e}")
+        for employee in get_all_employees():
+            employee_combo.addItem(employee['full_name'], employee['employee_id'])
 
         # Base salary and bonus fields
         base_salary_input = QLineEdit()
@@ -389,15 +632,15 @@ class SalarySheet(QWidget):
                 status = status_combo.currentText()
 
                 if salary_data:
-                    success = self.save_salary(employee_id, base_salary, bonus, 
-                                            payment_date_str, status, salary_data['id'])
+                    salary_id = self.save_salary(employee_id, base_salary, bonus, 
+                                              payment_date_str, status, salary_data['id'])
                 else:
-                    success = self.save_salary(employee_id, base_salary, bonus, 
-                                            payment_date_str, status)
+                    salary_id = self.save_salary(employee_id, base_salary, bonus, 
+                                              payment_date_str, status)
 
-                if success:
+                if salary_id:
                     dialog.accept()
-                    self.setup_table()
+                    self.refresh_row(salary_id)
                     self.show_success_message("Salary saved successfully!")
 
             except ValueError:
@@ -414,20 +657,22 @@ class SalarySheet(QWidget):
         dialog.exec()
 
     def edit_salary(self, row):
+        record = self.model.record(row)
         salary_data = {
-            'id': int(self.table.item(row, 0).text()),
-            'employee': self.table.item(row, 1).text(),
-            'base_salary': float(self.table.item(row, 2).text().replace('$', '').replace(',', '')),
-            'bonus': float(self.table.item(row, 3).text().replace('$', '').replace(',', '')),
-            'payment_date': self.table.item(row, 4).text(),
-            'status': self.table.item(row, 5).text()
+            'id': record['salary_id'],
+            'employee': record['employee_name'],
+            'base_salary': record['base_salary'],
+            'bonus': record['bonus'] or 0,
+            'payment_date': record['payment_date'].strftime("%Y-%m-%d"),
+            'status': record['payment_status']
         }
         self.show_salary_dialog(salary_data)
 
     def delete_salary(self, row):
         try:
-            salary_id = int(self.table.item(row, 0).text())
-            employee_name = self.table.item(row, 1).text()
+            record = self.model.record(row)
+            salary_id = record['salary_id']
+            employee_name = record['employee_name']
 
             reply = QMessageBox.question(
                 self,
@@ -438,18 +683,19 @@ class SalarySheet(QWidget):
             )
 
             if reply == QMessageBox.StandardButton.Yes:
-                connection = get_db_connection()
-                cursor = connection.cursor()
+                with db_connection() as connection:
+                    cursor = connection.cursor()
 
-                query = "DELETE FROM salaries WHERE salary_id = %s"
-                cursor.execute(query, (salary_id,))
-                connection.commit()
+                    apply_stat_deltas(cursor, salary_stat_deltas(cursor, salary_id, -1))
+                    query = "DELETE FROM salaries WHERE salary_id = %s"
+                    cursor.execute(query, (salary_id,))
+                    connection.commit()
 
-                cursor.close()
-                connection.close()
+                    cursor.close()
+                invalidate_cache('salaries')
 
+                self.refresh_row(salary_id)
                 self.show_success_message("Salary record deleted successfully!")
-                self.setup_table()
 
         except Error as e:
             QMessageBox.critical(
@@ -461,21 +707,21 @@ class SalarySheet(QWidget):
 
     def mark_as_paid(self, row):
         try:
-            salary_id = int(self.table.item(row, 0).text())
-            employee_name = self.table.item(row, 1).text()
+            record = self.model.record(row)
+            salary_id = record['salary_id']
+            employee_name = record['employee_name']
 
-            connection = get_db_connection()
-            cursor = connection.cursor()
+            with db_connection() as connection:
+                cursor = connection.cursor()
 
-            query = "UPDATE salaries SET payment_status = 'paid' WHERE salary_id = %s"
-            cursor.execute(query, (salary_id,))
-            connection.commit()
+                query = "UPDATE salaries SET payment_status = 'paid' WHERE salary_id = %s"
+                cursor.execute(query, (salary_id,))
+                connection.commit()
 
-            cursor.close()
-            connection.close()
+                cursor.close()
 
+            self.refresh_row(salary_id)
             self.show_success_message(f"Salary marked as paid for {employee_name}")
-            self.setup_table()
 
         except Error as e:
             QMessageBox.critical(
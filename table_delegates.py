@@ -0,0 +1,99 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtCore import Qt, QEvent, QPoint, QRect, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter
+
+class StatusPillDelegate(QStyledItemDelegate):
+    """Paints the cell text as a coloured, rounded status pill."""
+
+    def __init__(self, colors, default_color, parent=None):
+        super().__init__(parent)
+        self.colors = {status: QColor(color) for status, color in colors.items()}
+        self.default_color = QColor(default_color)
+        self.text_color = QColor("white")
+
+    def paint(self, painter, option, index):
+        background = index.data(Qt.ItemDataRole.BackgroundRole)
+        if background is not None:
+            painter.fillRect(option.rect, background)
+
+        text = index.data(Qt.ItemDataRole.DisplayRole)
+        if not text:
+            return
+
+        font = QFont(option.font)
+        font.setWeight(QFont.Weight.Medium)
+        metrics = QFontMetrics(font)
+        width = metrics.horizontalAdvance(text) + 24
+        height = metrics.height() + 12
+        pill = QRect(0, 0, width, height)
+        pill.moveCenter(option.rect.center())
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.colors.get(text, self.default_color))
+        painter.drawRoundedRect(pill, 4, 4)
+        painter.setFont(font)
+        painter.setPen(self.text_color)
+        painter.drawText(pill, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Paints a "⋮" button in every cell of a column.
+
+    Clicking the button emits clicked(row, global_pos) so the page can pop
+    up a single context menu for that row, instead of every row owning its
+    own QPushButton and QMenu. The delegate must be parented to its view.
+    """
+
+    clicked = pyqtSignal(int, QPoint)
+
+    def __init__(self, view, size=24, font_size=20, color="#64748b",
+                 background=None, hover_background="#f1f5f9"):
+        super().__init__(view)
+        self.view = view
+        self.size = size
+        self.color = QColor(color)
+        self.background = QColor(background) if background else None
+        self.hover_background = QColor(hover_background)
+        self.font = QFont()
+        self.font.setPixelSize(font_size)
+        self.font.setBold(True)
+        view.setMouseTracking(True)
+        view.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+    def button_rect(self, cell_rect):
+        rect = QRect(0, 0, self.size, self.size)
+        rect.moveCenter(cell_rect.center())
+        return rect
+
+    def paint(self, painter, option, index):
+        background = index.data(Qt.ItemDataRole.BackgroundRole)
+        if background is not None:
+            painter.fillRect(option.rect, background)
+
+        rect = self.button_rect(option.rect)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        button_background = self.hover_background if hovered else self.background
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if button_background is not None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(button_background)
+            painter.drawRoundedRect(rect, 4, 4)
+        painter.setFont(self.font)
+        painter.setPen(self.color)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "⋮")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            rect = self.button_rect(option.rect)
+            if rect.contains(event.position().toPoint()):
+                pos = self.view.viewport().mapToGlobal(rect.bottomLeft())
+                self.clicked.emit(index.row(), pos)
+                return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,191 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QColor
+from data_loader import DataLoader
+
+class PagedTableModel(QAbstractTableModel):
+    """Read-only table model that pulls its rows from the database a page at a time.
+
+    Subclasses set ``headers`` and implement fetch_page(), cursor_key() and
+    display(). Views call canFetchMore()/fetchMore() as the user scrolls, so
+    only the rows that have been scrolled into view are ever loaded.
+
+    Rows are kept ordered by cursor_key() (descending unless ``descending``
+    is False). After a single record changes, refresh_record() re-reads just
+    that record via fetch_record() and updates, inserts or removes its row.
+
+    fetch_page() and fetch_record() run on a worker thread through
+    ``self.loader`` and must not touch the model; rows are added when their
+    results arrive. Connect to loader.busy_changed for a loading state and to
+    load_failed for errors.
+    """
+
+    headers = []
+    page_size = 100
+    descending = True
+
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._cursor = None
+        self._exhausted = False
+        self._fetching = False
+        self._interrupted = False
+        self.loader = DataLoader(self)
+
+    # Hooks for subclasses
+    def fetch_page(self, after, limit):
+        # Return up to `limit` records (dicts) that sort after the keyset cursor `after`
+        raise NotImplementedError
+
+    def cursor_key(self, record):
+        # Keyset cursor for the page following `record`
+        raise NotImplementedError
+
+    def record_key(self, record):
+        # Primary key of a record
+        raise NotImplementedError
+
+    def fetch_record(self, key):
+        # Return the current record for a primary key, or None if it no longer exists
+        raise NotImplementedError
+
+    def display(self, record, column):
+        raise NotImplementedError
+
+    def foreground(self, record, column):
+        return None
+
+    # QAbstractTableModel interface
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._rows[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display(record, index.column())
+        if role == Qt.ItemDataRole.UserRole:
+            return record
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return QColor("#f8fafc") if index.row() % 2 else QColor("white")
+        if role == Qt.ItemDataRole.ForegroundRole:
+            color = self.foreground(record, index.column())
+            return QColor(color) if color else None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        self.loader.submit(self.fetch_page, self._cursor, self.page_size,
+                           on_result=self._append_page, on_error=self._fetch_failed,
+                           channel="page")
+
+    def _fetch_failed(self, error):
+        self._fetching = False
+        self.load_failed.emit(str(error))
+
+    def _append_page(self, records):
+        self._fetching = False
+        if len(records) < self.page_size:
+            self._exhausted = True
+        if not records:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self._rows.extend(records)
+        self.endInsertRows()
+        self._cursor = self.cursor_key(records[-1])
+
+    # Helpers
+    def record(self, row):
+        return self._rows[row]
+
+    def find_row(self, key):
+        for row, record in enumerate(self._rows):
+            if self.record_key(record) == key:
+                return row
+        return None
+
+    def _insert_position(self, sort_key):
+        low, high = 0, len(self._rows)
+        while low < high:
+            mid = (low + high) // 2
+            mid_key = self.cursor_key(self._rows[mid])
+            if (mid_key > sort_key) if self.descending else (mid_key < sort_key):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def refresh_record(self, key):
+        """Re-read one record and update, insert or remove just its row"""
+        self.loader.submit(self.fetch_record, key,
+                           on_result=lambda record: self._apply_record(key, record),
+                           on_error=self._fetch_failed,
+                           channel=("record", key))
+
+    def _apply_record(self, key, record):
+        row = self.find_row(key)
+
+        if row is not None:
+            if record is not None and self.cursor_key(record) == self.cursor_key(self._rows[row]):
+                self._rows[row] = record
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+                return
+            # Deleted, or its sort position changed
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+
+        if record is None:
+            return
+        position = self._insert_position(self.cursor_key(record))
+        if position == len(self._rows) and not self._exhausted:
+            # Sorts after everything loaded so far; it will arrive with a later page
+            return
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, record)
+        self.endInsertRows()
+
+    def cancel_loading(self):
+        # Drop an outstanding page request; the next fetchMore() picks up where
+        # paging stopped. Single-record refreshes are left to finish.
+        self.loader.cancel("page")
+        self._interrupted = self._fetching
+        self._fetching = False
+
+    def resume_loading(self):
+        # Re-issue a page request that cancel_loading() dropped
+        if self._interrupted:
+            self._interrupted = False
+            self.fetchMore()
+
+    def reload(self):
+        # Drop everything loaded so far and start again from the first page
+        self.loader.cancel()
+        self.beginResetModel()
+        self._rows = []
+        self._cursor = None
+        self._exhausted = False
+        self._fetching = False
+        self._interrupted = False
+        self.endResetModel()
+        self.fetchMore()
@@ -0,0 +1,125 @@
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mysql.connector import Error
+import db
+import salary_sheet
+from db import db_connection, close_db_connection
+
+# Tables smaller than this are ignored: MySQL rightly prefers a full scan
+# over an index on a handful of rows, so only scans of real tables count.
+MIN_TABLE_ROWS = int(os.getenv('EXPLAIN_MIN_TABLE_ROWS', 1000))
+
+TODAY = date.today()
+SALARY_FILTERS = {'status': 'pending', 'month_from': TODAY.replace(month=1, day=1), 'month_to': TODAY}
+
+# (name, function, args) for the hot queries, with representative arguments.
+# Each function is called with a recording connection and the first query
+# it sends is explained, so the check always runs the application's SQL.
+# Cached lookups are called through __wrapped__ to bypass the query cache.
+HOT_QUERIES = [
+    ("invoice page (first)", db.get_invoice_page, (None, 100)),
+    ("invoice page (next)", db.get_invoice_page, ((TODAY, 1000), 100)),
+    ("single invoice", db.get_invoice, (1,)),
+    ("active employees", db._active_employees.__wrapped__, ()),
+    ("latest salary", db._latest_salary.__wrapped__, (1,)),
+    ("month invoice run", db.generate_month_invoices, (TODAY, TODAY)),
+    ("invoices in month", db.get_month_invoices, (TODAY, ('draft', 'sent'))),
+    ("dashboard stats", db.get_dashboard_stats, ('all',)),
+    ("salary sheet page (next)",
+     salary_sheet.fetch_salary_page, ({}, 'salary_id', True, (None, 1000), 100)),
+    ("salary sheet by status and month",
+     salary_sheet.fetch_salary_page, (SALARY_FILTERS, 'payment_date', True, None, 100)),
+    ("salary sheet by base salary (next)",
+     salary_sheet.fetch_salary_page, ({}, 'base_salary', True, (50000, 1000), 100)),
+]
+
+
+class CapturedQuery(Exception):
+    # Raised by the recording cursor to stop a function at its first query;
+    # not a mysql Error, so the functions' error handling lets it through
+    def __init__(self, query, params):
+        super().__init__(query)
+        self.query = query
+        self.params = params
+
+
+class RecordingCursor:
+    def execute(self, query, params=()):
+        raise CapturedQuery(query, params)
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+@contextmanager
+def recording_connection():
+    yield RecordingConnection()
+
+def captured_query(fn, args):
+    """The first (query, params) fn sends to the database, without running it"""
+    with mock.patch.object(db, 'db_connection', recording_connection), \
+         mock.patch.object(salary_sheet, 'db_connection', recording_connection):
+        try:
+            fn(*args)
+        except CapturedQuery as captured:
+            return captured.query, captured.params
+    raise SystemExit(f"{fn.__name__} sent no query")
+
+def table_sizes(cursor):
+    cursor.execute("""
+        SELECT TABLE_NAME, TABLE_ROWS
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+    """)
+    return {name: rows or 0 for name, rows in cursor.fetchall()}
+
+def full_scans(cursor, query, params, sizes, aliases):
+    cursor.execute("EXPLAIN " + query, params)
+    columns = [c[0] for c in cursor.description]
+    scans = []
+    for row in cursor.fetchall():
+        plan = dict(zip(columns, row))
+        table = aliases.get(plan['table'], plan['table'])
+        if plan['type'] == 'ALL' and sizes.get(table, 0) >= MIN_TABLE_ROWS:
+            scans.append(f"{table} (~{plan['rows']} rows)")
+    return scans
+
+if __name__ == "__main__":
+    aliases = {'i': 'invoices', 'e': 'employees', 's': 'salaries'}
+    failures = 0
+    try:
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            sizes = table_sizes(cursor)
+            for name, fn, args in HOT_QUERIES:
+                query, params = captured_query(fn, args)
+                scans = full_scans(cursor, query, params, sizes, aliases)
+                if scans:
+                    failures += 1
+                    print(f"FULL SCAN  {name}: {', '.join(scans)}")
+                else:
+                    print(f"ok         {name}")
+            cursor.close()
+    except Error as e:
+        print(f"Error running EXPLAIN checks: {e}")
+        failures += 1
+    finally:
+        close_db_connection()
+
+    sys.exit(1 if failures else 0)
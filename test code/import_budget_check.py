@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Total import time allowed before the login window can be shown
+BUDGET_MS = int(os.getenv('LOGIN_IMPORT_BUDGET_MS', 800))
+
+# Heavy modules that must only be imported after login, on first use
+DEFERRED_MODULES = [
+    "main_window", "dashboard_view", "invoice_management", "invoice_generator",
+    "charts", "PyQt6.QtCharts", "reportlab", "smtplib", "email.mime"
+]
+
+def import_times():
+    """Import what main.py loads before showing the login window, in a fresh
+    interpreter, and return {module: self time in us}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import main, login, PyQt6.QtWidgets, PyQt6.QtGui"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing main failed:\n{result.stderr}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+def is_deferred(module):
+    return any(module == name or module.startswith(name + ".") for name in DEFERRED_MODULES)
+
+if __name__ == "__main__":
+    times = import_times()
+    total_ms = sum(times.values()) / 1000
+    early = sorted(module for module in times if is_deferred(module))
+
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:10]
+    print("Slowest imports:")
+    for module, self_us in slowest:
+        print(f"  {self_us / 1000:8.1f} ms  {module}")
+    print(f"Total: {total_ms:.1f} ms (budget {BUDGET_MS} ms)")
+
+    failures = 0
+    if early:
+        failures += 1
+        print(f"FAIL  imported before login: {', '.join(early)}")
+    if total_ms > BUDGET_MS:
+        failures += 1
+        print(f"FAIL  over import budget by {total_ms - BUDGET_MS:.1f} ms")
+    if not failures:
+        print("ok")
+
+    sys.exit(1 if failures else 0)
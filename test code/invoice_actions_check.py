@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from invoice_management import can_mark_paid
+
+# (status, whether "Mark as Paid" is offered)
+CASES = [
+    ('draft', True),
+    ('sent', True),  # emailed invoices are moved to 'sent' by the outbox
+    ('cancelled', True),
+    ('paid', False),
+]
+
+if __name__ == "__main__":
+    failed = [(status, expected) for status, expected in CASES if can_mark_paid(status) != expected]
+    for status, expected in CASES:
+        print(f"{status:<10} mark as paid offered: {can_mark_paid(status)}")
+    if failed:
+        raise SystemExit(f"Unexpected result for: {', '.join(status for status, _ in failed)}")
+    print("OK")
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from email_utils import Mailer, build_invoice_message
+
+# Run against a local debugging SMTP server, e.g.
+#   python -m aiosmtpd -n -l localhost:8025
+HOST = os.getenv('MAILER_CHECK_HOST', 'localhost')
+PORT = int(os.getenv('MAILER_CHECK_PORT', 8025))
+COUNT = int(os.getenv('MAILER_CHECK_COUNT', 50))
+
+def messages(count):
+    pdf_bytes = b"%PDF-1.4\n%%EOF\n"
+    return [
+        build_invoice_message("ems@localhost", f"employee{n}@localhost", f"INV-CHECK-{n:03d}", pdf_bytes)
+        for n in range(count)
+    ]
+
+def mailer():
+    return Mailer(host=HOST, port=PORT, sender_email="ems@localhost", password="", starttls=False)
+
+if __name__ == "__main__":
+    # One session per message
+    start = time.perf_counter()
+    for msg in messages(COUNT):
+        with mailer() as single:
+            single.send(msg)
+    per_message = time.perf_counter() - start
+
+    # One session for the whole batch, dropped halfway to exercise reconnect
+    batch = messages(COUNT)
+    start = time.perf_counter()
+    with mailer() as shared:
+        results = shared.send_many(batch[:COUNT // 2])
+        shared._server.close()
+        results += shared.send_many(batch[COUNT // 2:])
+    reused = time.perf_counter() - start
+
+    failed = [msg['To'] for msg, error in results if error]
+    print(f"{COUNT} messages, new session each: {per_message:.2f}s")
+    print(f"{COUNT} messages, one session:      {reused:.2f}s")
+    if failed:
+        print(f"FAIL  {len(failed)} message(s) not sent: {', '.join(failed)}")
+    else:
+        print("ok")
+    sys.exit(1 if failed else 0)
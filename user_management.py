@@ -3,9 +3,42 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
                            QMessageBox, QMenu, QFrame, QDialog, QFormLayout,
                            QLineEdit, QDateEdit, QLabel)
 from PyQt6.QtCore import Qt, QDate, QDateTime
-from PyQt6.QtGui import QColor, QIcon, QFont, QAction
+from PyQt6.QtGui import QColor, QIcon, QFont
 from mysql.connector import Error
-from db import get_db_connection
+from db import db_connection, apply_stat_deltas, employee_stat_deltas, invalidate_cache
+from data_loader import DataLoader
+from table_delegates import ActionButtonDelegate
+
+EMPLOYEE_ROW_QUERY = """
+    SELECT 
+        employee_id, 
+        first_name, 
+        last_name, 
+        email, 
+        phone,
+        position, 
+        hire_date, 
+        status, 
+        created_at
+    FROM employees
+"""
+
+# Run on a DataLoader worker thread
+def fetch_employee_rows():
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(EMPLOYEE_ROW_QUERY + " ORDER BY employee_id")
+        rows = cursor.fetchall()
+        cursor.close()
+    return rows
+
+def fetch_employee_row(user_id):
+    with db_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(EMPLOYEE_ROW_QUERY + " WHERE employee_id = %s", (user_id,))
+        row_data = cursor.fetchone()
+        cursor.close()
+    return row_data
 
 class UserManagement(QWidget):
     def __init__(self, user_data):
@@ -61,6 +94,12 @@ class UserManagement(QWidget):
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(15, 10, 15, 10)
         header_layout.addWidget(title)
+
+        # Shown while employees are being fetched in the background
+        self.loading_label = QLabel("Loading...")
+        self.loading_label.setStyleSheet("color: white; font-size: 14px; background: transparent;")
+        self.loading_label.hide()
+        header_layout.addWidget(self.loading_label)
         
         # Update Add User button
         add_btn = QPushButton("＋ New User")
@@ -92,6 +131,7 @@ class UserManagement(QWidget):
             QTableWidget {
                 border: none;
                 background-color: white;
+                alternate-background-color: #f8fafc;
                 gridline-color: #e2e8f0;
                 border-radius: 12px;
             }
@@ -129,6 +169,15 @@ class UserManagement(QWidget):
                 background: none;
             }
         """)
+        # The "⋮" button is painted by a delegate rather than a widget per row
+        action_delegate = ActionButtonDelegate(self.table)
+        action_delegate.clicked.connect(self.show_action_menu)
+        self.table.setItemDelegateForColumn(9, action_delegate)
+        self.action_menu = None
+
+        self.loader = DataLoader(self)
+        self.loader.busy_changed.connect(self.loading_label.setVisible)
+        self.loaded = False
         self.setup_table()
         table_layout.addWidget(self.table)
         layout.addWidget(table_frame)
@@ -147,6 +196,7 @@ class UserManagement(QWidget):
         self.table.horizontalHeader().setFixedHeight(50)
         self.table.verticalHeader().setVisible(False)
         self.table.setShowGrid(True)
+        self.table.setAlternatingRowColors(True)
         
         # Make table responsive
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
@@ -170,132 +220,120 @@ class UserManagement(QWidget):
             self.table.setColumnWidth(col, width)
             if col == 3:  # Make email column stretch
                 self.table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
-        
-        try:
-            connection = get_db_connection()
-            cursor = connection.cursor()
-            
-            # Updated query to match actual table structure
-            query = """
-                SELECT 
-                    employee_id, 
-                    first_name, 
-                    last_name, 
-                    email, 
-                    phone,
-                    position, 
-                    hire_date, 
-                    status, 
-                    created_at
-                FROM employees
-                ORDER BY employee_id
-            """
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            
-            self.table.setRowCount(len(rows))
-            
-            for row_idx, row_data in enumerate(rows):
-                bg_color = "#f8fafc" if row_idx % 2 else "white"
-                
-                for col, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    item.setBackground(QColor(bg_color))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                    
-                    # Set status color
-                    if col == 7:  # Status column (updated index)
-                        if value and value.lower() == "active":
-                            item.setForeground(QColor("#22c55e"))
-                        else:
-                            item.setForeground(QColor("#ef4444"))
-                    
-                    self.table.setItem(row_idx, col, item)
-                
-                # Add action button
-                action_widget = QWidget()
-                action_layout = QHBoxLayout(action_widget)
-                action_layout.setContentsMargins(0, 0, 0, 0)
-                action_layout.setSpacing(0)
-                
-                action_btn = QPushButton("⋮")
-                action_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: transparent;
-                        color: #64748b;
-                        border: none;
-                        padding: 0px;
-                        font-size: 20px;
-                        font-weight: bold;
-                        min-width: 24px;
-                        max-width: 24px;
-                        min-height: 24px;
-                        max-height: 24px;
-                        text-align: center;
-                        line-height: 24px;
-                    }
-                    QPushButton:hover {
-                        background-color: #f1f5f9;
-                        border-radius: 4px;
-                    }
-                """)
-                action_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-                
-                menu = QMenu(self)
-                menu.setStyleSheet("""
-                    QMenu {
-                        background-color: white;
-                        border: 1px solid #e2e8f0;
-                        border-radius: 8px;
-                        padding: 8px 0px;
-                    }
-                    QMenu::item {
-                        padding: 8px 24px;
-                        font-size: 14px;
-                    }
-                    QMenu::item:selected {
-                        background-color: #f1f5f9;
-                        color: #1e293b;
-                    }
-                """)
-                
-                # Create actions
-                edit_action = QAction("✎ Edit", self)
-                delete_action = QAction("🗑 Delete", self)
-                
-                # Connect actions directly
-                edit_action.triggered.connect(lambda checked, r=row_idx: self.edit_user(r))
-                delete_action.triggered.connect(lambda checked, r=row_idx: self.delete_user(r))
-                
-                # Add actions to menu
-                menu.addAction(edit_action)
-                menu.addAction(delete_action)
-                
-                # Connect button to show menu
-                action_btn.clicked.connect(lambda checked, b=action_btn, m=menu: self.show_action_menu(b, m))
-                
-                action_layout.addStretch()
-                action_layout.addWidget(action_btn)
-                action_layout.addStretch()
-                
-                self.table.setCellWidget(row_idx, len(row_data), action_widget)
+
+    def load_data(self):
+        """Fetch every employee row in the background and fill the table"""
+        self.loader.submit(fetch_employee_rows, on_result=self.populate_table,
+                           on_error=self.show_load_error, channel="rows")
+
+    def populate_table(self, rows):
+        self.table.setRowCount(len(rows))
+        for row_idx, row_data in enumerate(rows):
+            self.set_row(row_idx, row_data)
+        self.loaded = True
+
+    def show_load_error(self, error):
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to fetch employee data: {str(error)}",
+            QMessageBox.StandardButton.Ok
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.loaded:
+            self.load_data()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Navigating away: drop a full load the user is no longer waiting for
+        if not event.spontaneous():
+            self.loader.cancel("rows")
+
+    def set_row(self, row_idx, row_data):
+        for col, value in enumerate(row_data):
+            item = QTableWidgetItem(str(value))
+            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
             
-            cursor.close()
-            connection.close()
+            # Set status color
+            if col == 7:  # Status column (updated index)
+                if value and value.lower() == "active":
+                    item.setForeground(QColor("#22c55e"))
+                else:
+                    item.setForeground(QColor("#ef4444"))
             
-        except Error as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"Failed to fetch employee data: {str(e)}",
-                QMessageBox.StandardButton.Ok
-            )
-
-    def show_action_menu(self, button, menu):
-        """Show the action menu below the button"""
-        pos = button.mapToGlobal(button.rect().bottomLeft())
-        menu.exec(pos)
+            self.table.setItem(row_idx, col, item)
+
+    def find_row(self, user_id):
+        # Rows are ordered by employee_id, so binary search for the row
+        # holding user_id (or the row it should be inserted before)
+        low, high = 0, self.table.rowCount()
+        while low < high:
+            mid = (low + high) // 2
+            if int(self.table.item(mid, 0).text()) < user_id:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def refresh_row(self, user_id):
+        """Update, insert or remove the single row for user_id"""
+        self.loader.submit(fetch_employee_row, user_id,
+                           on_result=lambda row_data: self.apply_row(user_id, row_data),
+                           on_error=lambda e: self.refresh_failed(user_id, e),
+                           channel=("row", user_id))
+
+    def refresh_failed(self, user_id, error):
+        print(f"Error refreshing employee {user_id}: {error}")
+        self.load_data()
+
+    def apply_row(self, user_id, row_data):
+        row_idx = self.find_row(user_id)
+        exists = (row_idx < self.table.rowCount()
+                  and int(self.table.item(row_idx, 0).text()) == user_id)
+
+        if row_data is None:
+            if exists:
+                self.table.removeRow(row_idx)
+            return
+        if not exists:
+            self.table.insertRow(row_idx)
+        self.set_row(row_idx, row_data)
+
+    def show_action_menu(self, row, pos):
+        """Show the action menu for a row below its button"""
+        if self.action_menu is None:
+            # One menu for the whole table, built the first time it is needed
+            self.action_menu = QMenu(self)
+            self.action_menu.setStyleSheet("""
+                QMenu {
+                    background-color: white;
+                    border: 1px solid #e2e8f0;
+                    border-radius: 8px;
+                    padding: 8px 0px;
+                }
+                QMenu::item {
+                    padding: 8px 24px;
+                    font-size: 14px;
+                }
+                QMenu::item:selected {
+                    background-color: #f1f5f9;
+                    color: #1e293b;
+                }
+            """)
+
+        menu = self.action_menu
+        menu.clear()
+        edit_action = menu.addAction("✎ Edit")
+        delete_action = menu.addAction("🗑 Delete")
+
+        chosen = menu.exec(pos)
+        if chosen == edit_action:
+            self.edit_user(row)
+        elif chosen == delete_action:
+            self.delete_user(row)
 
     def delete_user(self, row):
         try:
@@ -314,26 +352,27 @@ class UserManagement(QWidget):
             
             if reply == QMessageBox.StandardButton.Yes:
                 # Connect to database
-                connection = get_db_connection()
-                cursor = connection.cursor()
+                with db_connection() as connection:
+                    cursor = connection.cursor()
                 
-                # Execute delete query
-                query = "DELETE FROM employees WHERE employee_id = %s"
-                cursor.execute(query, (user_id,))
+                    # Execute delete query
+                    apply_stat_deltas(cursor, employee_stat_deltas(cursor, user_id, -1))
+                    query = "DELETE FROM employees WHERE employee_id = %s"
+                    cursor.execute(query, (user_id,))
                 
-                # Commit the transaction
-                connection.commit()
+                    # Commit the transaction
+                    connection.commit()
                 
-                # Close database connections
-                cursor.close()
-                connection.close()
+                    # Close database connections
+                    cursor.close()
+                invalidate_cache('employees')
+                
+                # Drop just this row from the table
+                self.refresh_row(user_id)
                 
                 # Show success message
                 self.show_success_message("User deleted successfully!")
                 
-                # Refresh the table
-                self.setup_table()
-                
         except Error as e:
             print(f"Database Error: {str(e)}")
             QMessageBox.critical(
@@ -456,35 +495,38 @@ class UserManagement(QWidget):
         
         if dialog.exec():
             try:
-                connection = get_db_connection()
-                cursor = connection.cursor()
-
-                # Get values from dialog
-                first_name = dialog.findChild(QLineEdit, "first_name").text()
-                last_name = dialog.findChild(QLineEdit, "last_name").text()
-                email = dialog.findChild(QLineEdit, "email").text()
-                phone = dialog.findChild(QLineEdit, "phone").text()
-                position = dialog.findChild(QLineEdit, "position").text()
-                hire_date = dialog.findChild(QDateEdit, "hire_date").date().toString("yyyy-MM-dd")
-
-                # Insert new user
-                query = """
-                    INSERT INTO employees (
-                        first_name, last_name, email, phone, 
-                        position, hire_date, status, created_at
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
-                """
-                values = (
-                    first_name, last_name, email, phone,
-                    position, hire_date, "active"
-                )
+                with db_connection() as connection:
+                    cursor = connection.cursor()
+
+                    # Get values from dialog
+                    first_name = dialog.findChild(QLineEdit, "first_name").text()
+                    last_name = dialog.findChild(QLineEdit, "last_name").text()
+                    email = dialog.findChild(QLineEdit, "email").text()
+                    phone = dialog.findChild(QLineEdit, "phone").text()
+                    position = dialog.findChild(QLineEdit, "position").text()
+                    hire_date = dialog.findChild(QDateEdit, "hire_date").date().toString("yyyy-MM-dd")
+
+                    # Insert new user
+                    query = """
+                        INSERT INTO employees (
+                            first_name, last_name, email, phone, 
+                            position, hire_date, status, created_at
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+                    """
+                    values = (
+                        first_name, last_name, email, phone,
+                        position, hire_date, "active"
+                    )
                 
-                cursor.execute(query, values)
-                connection.commit()
-                cursor.close()
+                    cursor.execute(query, values)
+                    user_id = cursor.lastrowid
+                    apply_stat_deltas(cursor, employee_stat_deltas(cursor, user_id, 1))
+                    connection.commit()
+                    cursor.close()
+                invalidate_cache('employees')
 
-                # Refresh table
-                self.setup_table()
+                # Show the new row
+                self.refresh_row(user_id)
 
                 self.show_success_message("User added successfully!")
 
@@ -500,7 +542,7 @@ class UserManagement(QWidget):
         dialog = self.create_user_dialog(is_edit=True)
         
         # Get current values
-        user_id = self.table.item(row, 0).text()
+        user_id = int(self.table.item(row, 0).text())
         first_name = self.table.item(row, 1).text()
         last_name = self.table.item(row, 2).text()
         email = self.table.item(row, 3).text()
@@ -518,39 +560,42 @@ class UserManagement(QWidget):
         
         if dialog.exec():
             try:
-                connection = get_db_connection()
-                cursor = connection.cursor()
-
-                # Get updated values
-                first_name = dialog.findChild(QLineEdit, "first_name").text()
-                last_name = dialog.findChild(QLineEdit, "last_name").text()
-                email = dialog.findChild(QLineEdit, "email").text()
-                phone = dialog.findChild(QLineEdit, "phone").text()
-                position = dialog.findChild(QLineEdit, "position").text()
-                hire_date = dialog.findChild(QDateEdit, "hire_date").date().toString("yyyy-MM-dd")
-
-                # Update user
-                query = """
-                    UPDATE employees SET 
-                        first_name = %s,
-                        last_name = %s,
-                        email = %s,
-                        phone = %s,
-                        position = %s,
-                        hire_date = %s
-                    WHERE employee_id = %s
-                """
-                values = (
-                    first_name, last_name, email, phone,
-                    position, hire_date, user_id
-                )
+                with db_connection() as connection:
+                    cursor = connection.cursor()
+
+                    # Get updated values
+                    first_name = dialog.findChild(QLineEdit, "first_name").text()
+                    last_name = dialog.findChild(QLineEdit, "last_name").text()
+                    email = dialog.findChild(QLineEdit, "email").text()
+                    phone = dialog.findChild(QLineEdit, "phone").text()
+                    position = dialog.findChild(QLineEdit, "position").text()
+                    hire_date = dialog.findChild(QDateEdit, "hire_date").date().toString("yyyy-MM-dd")
+
+                    # Update user
+                    query = """
+                        UPDATE employees SET 
+                            first_name = %s,
+                            last_name = %s,
+                            email = %s,
+                            phone = %s,
+                            position = %s,
+                            hire_date = %s
+                        WHERE employee_id = %s
+                    """
+                    values = (
+                        first_name, last_name, email, phone,
+                        position, hire_date, user_id
+                    )
                 
-                cursor.execute(query, values)
-                connection.commit()
-                cursor.close()
-
-                # Refresh table
-                self.setup_table()
+                    apply_stat_deltas(cursor, employee_stat_deltas(cursor, user_id, -1))
+                    cursor.execute(query, values)
+                    apply_stat_deltas(cursor, employee_stat_deltas(cursor, user_id, 1))
+                    connection.commit()
+                    cursor.close()
+                invalidate_cache('employees')
+
+                # Update just the edited row
+                self.refresh_row(user_id)
 
                 self.show_success_message("User updated successfully!")
 